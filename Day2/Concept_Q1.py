@@ -1,9 +1,10 @@
-import pandas as pd
-import numpy as np
-from statsmodels.tsa.seasonal import seasonal_decompose
 import sys
 import os
 
+sys.path.append(os.path.dirname(sys.path[0]))
+from instrument import event, traced
+
+@traced()
 def solve():
     try:
         # Step 2: Load the dataset
@@ -13,37 +14,28 @@ def solve():
         if not os.path.exists(filename):
             print("File not found.")
             return
+
+        # pandas is imported only once the input is known to exist
+        from csv_loader import load_csv
+        from decompose import decompose
         
-        df = pd.read_csv(filename)
-        
-        # Step 3: Parse date column
-        df['DATE'] = pd.to_datetime(df['DATE'], dayfirst=True)
-        df.set_index('DATE', inplace=True)
+        # Step 3: Parse date column (format detected once, parsed data cached)
+        df = load_csv(filename, date_col='DATE', dayfirst=True)
         
         # Output 1: First 5 rows of the dataset
         print("First 5 records of dataset:")
         print(df.head())
         print()
         
-        # Step 5: Data preprocessing
-        # Handle missing values using mean imputation
-        df['Consumption'] = df['Consumption'].fillna(df['Consumption'].mean())
-        
-        # Handle outliers using IQR method
-        Q1 = df['Consumption'].quantile(0.25)
-        Q3 = df['Consumption'].quantile(0.75)
-        IQR = Q3 - Q1
-        lower_bound = Q1 - 1.5 * IQR
-        upper_bound = Q3 + 1.5 * IQR
-        df['Consumption'] = df['Consumption'].clip(lower=lower_bound, upper=upper_bound)
+        # Steps 5-7: Data preprocessing (mean imputation, IQR outlier clipping)
+        # fused with the additive and multiplicative decompositions, which
+        # share a single moving-average trend
+        add_result, mul_result = decompose(df['Consumption'], period=12, impute=True, iqr_clip=1.5)
         
         # Output 2: Data preprocessing status
         print("Data preprocessing completed.")
         print()
         
-        # Step 6: Additive decomposition
-        add_result = seasonal_decompose(df['Consumption'], model='additive', period=12)
-        
         # Output 3: Additive decomposition components
         print("Additive Model Components (First 5 Values)")
         print("Trend:")
@@ -56,9 +48,6 @@ def solve():
         print(add_result.resid.dropna().head())
         print()
         
-        # Step 7: Multiplicative decomposition
-        mul_result = seasonal_decompose(df['Consumption'], model='multiplicative', period=12)
-        
         # Output 4: Multiplicative decomposition components
         print("Multiplicative Model Components (First 5 Values)")
         print("Trend:")
@@ -76,8 +65,9 @@ def solve():
         print("If seasonal values are constant → Additive model fits better.")
         print("If seasonal values change proportionally with trend → Multiplicative model fits better.")
 
-    except Exception:
-        pass
+    except Exception as exc:
+        # Output stays silent on errors; the trace still records them
+        event('error', error=f"{type(exc).__name__}: {exc}")
 
 if __name__ == "__main__":
     solve()
@@ -1,12 +1,14 @@
-import pandas as pd
-from statsmodels.tsa.arima.model import ARIMA
 import os
 import sys
 import warnings
 
+sys.path.append(os.path.dirname(sys.path[0]))
+from instrument import traced
+
 # Suppress warnings
 warnings.filterwarnings("ignore")
 
+@traced()
 def solve():
     # Read filename
     try:
@@ -18,24 +20,25 @@ def solve():
         return
         
     file_path = os.path.join(sys.path[0], filename)
+    if not os.path.isfile(file_path):
+        return
+
+    from csv_loader import load_csv, set_frequency
+    from model_cache import cached_fit
+    from result_export import ModelReport
     
-    # Load dataset
+    # Load dataset, parsing Datetime as the index
     try:
-        df = pd.read_csv(file_path)
+        df = load_csv(file_path, date_col='Datetime')
     except Exception:
         return
     
-    # Parse Datetime and set as index
-    if 'Datetime' in df.columns:
-        df['Datetime'] = pd.to_datetime(df['Datetime'])
-        df.set_index('Datetime', inplace=True)
-    
     # Drop rows with missing values in Power_Consumption_diff
     df = df.dropna(subset=['Power_Consumption_diff'])
     
     # Set frequency (Monthly)
     if not df.index.freq:
-        df.index.freq = pd.infer_freq(df.index)
+        df = set_frequency(df)
     
     # Train-Test Split (80:20)
     train_size = int(len(df) * 0.8)
@@ -47,21 +50,15 @@ def solve():
     print(f"Training data size: {train_size}")
     print(f"Testing data size: {test_size}")
     
-    # AR(2) Model
-    ar_model = ARIMA(train, order=(2, 0, 0))
-    ar_results = ar_model.fit()
+    # AR(2) Model (reused from the model cache while the data is unchanged)
+    ar_results = cached_fit(train, order=(2, 0, 0))
     print("\nAR(2) Model Summary:")
-    summary_ar = str(ar_results.summary())
-    for line in summary_ar.split('\n'):
-        print(line.rstrip())
+    print(ModelReport(ar_results).render(rstrip=True))
     
     # MA(1) Model
-    ma_model = ARIMA(train, order=(0, 0, 1))
-    ma_results = ma_model.fit()
+    ma_results = cached_fit(train, order=(0, 0, 1))
     print("\nMA(1) Model Summary:")
-    summary_ma = str(ma_results.summary())
-    for line in summary_ma.split('\n'):
-        print(line.rstrip())
+    print(ModelReport(ma_results).render(rstrip=True))
 
 if __name__ == "__main__":
     solve()
\ No newline at end of file
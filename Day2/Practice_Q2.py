@@ -1,14 +1,15 @@
-import pandas as pd
-import numpy as np
 import os
 import sys
-from statsmodels.tsa.arima.model import ARIMA
-from statsmodels.stats.diagnostic import acorr_ljungbox
 import warnings
 
+sys.path.append(os.path.dirname(sys.path[0]))
+from instrument import stage, traced
+from order_search import ar_ma_orders, order_label, search_orders
+
 # Suppress warnings
 warnings.filterwarnings("ignore")
 
+@traced()
 def solve():
     # Read filename
     try:
@@ -20,89 +21,52 @@ def solve():
         return
         
     file_path = os.path.join(sys.path[0], filename)
-    
-    # Load dataset
+    if not os.path.isfile(file_path):
+        return
+
+    # Load Close_diff alone from the memory-mapped series store; Date,
+    # Datetime or the first column becomes the index
+    from series_store import load_series
     try:
-        df = pd.read_csv(file_path)
+        close_diff = load_series(file_path, 'Close_diff')
     except Exception:
         return
     
-    # Identify Date column
-    date_col = 'Date' if 'Date' in df.columns else ('Datetime' if 'Datetime' in df.columns else df.columns[0])
-    
-    # Parse Date and set as index
-    df[date_col] = pd.to_datetime(df[date_col])
-    df = df.sort_values(date_col)
+    close_diff = close_diff.sort_index()
     
     # Drop rows with missing values in Close_diff
-    df = df.dropna(subset=['Close_diff'])
-    df.set_index(date_col, inplace=True)
+    close_diff = close_diff.dropna()
     
     # Train-Test Split (80:20)
-    train_size = int(len(df) * 0.8)
-    test_size = len(df) - train_size
+    train_size = int(len(close_diff) * 0.8)
+    test_size = len(close_diff) - train_size
     
-    train = df['Close_diff'][:train_size]
+    train = close_diff[:train_size]
     
     # Output sizes
     print(f"Training data size: {train_size}")
     print(f"Testing data size: {test_size}")
     print()
     
-    # Grid Search for best AR(p) and MA(q) (1 to 5)
-    best_aic = np.inf
-    best_order = None
-    best_type = ""
-    
-    results_aic = {}
-    
-    # AR(p) models
-    for p in range(1, 6):
-        try:
-            model = ARIMA(train, order=(p, 0, 0))
-            res = model.fit()
-            aic = res.aic
-            print(f"AR({p}) AIC: {aic}")
-            if aic < best_aic:
-                best_aic = aic
-                best_order = p
-                best_type = "AR"
-        except:
-            pass
-            
-    # MA(q) models
-    for q in range(1, 6):
-        try:
-            model = ARIMA(train, order=(0, 0, q))
-            res = model.fit()
-            aic = res.aic
-            print(f"MA({q}) AIC: {aic}")
-            if aic < best_aic:
-                best_aic = aic
-                best_order = q
-                best_type = "MA"
-        except:
-            pass
+    # Grid Search for best AR(p) and MA(q) (1 to 5), fitted in parallel
+    search = search_orders(train, ar_ma_orders(5, 5), diagnose_lags=[1])
+    for order, aic in search.scores.items():
+        print(f"{order_label(order)} AIC: {aic}")
             
     print()
-    print(f"Best Model: {best_type}({best_order})")
-    
-    # Fit the best model
-    if best_type == "AR":
-        final_model = ARIMA(train, order=(best_order, 0, 0))
-    else:
-        final_model = ARIMA(train, order=(0, 0, best_order))
+    print(f"Best Model: {order_label(search.best_order)}")
     
-    final_res = final_model.fit()
+    # The best model was already fitted during the search
+    final_res = search.best
     
     # Print Model Summary
-    print(final_res.summary())
+    with stage('report'):
+        print(final_res.summary())
     print()
     
     # Ljung-Box Test Results at Lag 1
     print("Ljung-Box Test Results:")
-    lb_results = acorr_ljungbox(final_res.resid, lags=[1], return_df=True)
-    print(lb_results)
+    print(search.diagnostics.ljung_box(search.best_order))
 
 if __name__ == "__main__":
     solve()
@@ -1,14 +1,15 @@
-import pandas as pd
-import numpy as np
 import os
 import sys
-from statsmodels.tsa.arima.model import ARIMA
-from statsmodels.stats.diagnostic import acorr_ljungbox
 import warnings
 
+sys.path.append(os.path.dirname(sys.path[0]))
+from instrument import stage, traced
+from order_search import ar_ma_orders, order_label, search_orders
+
 # Suppress warnings for cleaner output
 warnings.filterwarnings("ignore")
 
+@traced()
 def solve():
     # Input format: CSV File Input
     try:
@@ -17,103 +18,55 @@ def solve():
         # So input() is correct.
         filename = input().strip()
         file_path = os.path.join(sys.path[0], filename)
-        df = pd.read_csv(file_path)
+        if not os.path.isfile(file_path):
+            return
+        from series_store import load_series
+        # Only Close_diff is read, as a view of the memory-mapped series store;
+        # Date, Datetime or the first column becomes the index
+        close_diff = load_series(file_path, 'Close_diff')
     except Exception:
         return
 
     # Data Cleaning
-    if 'Date' in df.columns:
-        date_col = 'Date'
-    elif 'Datetime' in df.columns:
-        date_col = 'Datetime'
-    else:
-        # Fallback to identify date column if names differ slightly
-        date_col = df.columns[0]
-
-    df[date_col] = pd.to_datetime(df[date_col])
-    df = df.sort_values(date_col)
+    close_diff = close_diff.sort_index()
     
     # Drop missing values in Close_diff
-    df = df.dropna(subset=['Close_diff'])
-    
-    # Set Date as index
-    df.set_index(date_col, inplace=True)
+    close_diff = close_diff.dropna()
     
     # Train-Test Split (80% training, 20% testing)
-    train_size = int(len(df) * 0.8)
-    test_size = len(df) - train_size
+    train_size = int(len(close_diff) * 0.8)
+    test_size = len(close_diff) - train_size
     
-    train = df.iloc[:train_size]
-    test = df.iloc[train_size:]
+    train = close_diff.iloc[:train_size]
+    test = close_diff.iloc[train_size:]
     
     print(f"Training data size: {train_size}")
     print(f"Testing data size: {test_size}")
     print()
     
-    # Model Selection
-    best_aic = np.inf
-    best_order = None
-    best_type = None
-    
-    results = {}
-    
-    # AR(p) models for p = 1 to 5
-    for p in range(1, 6):
-        try:
-            model = ARIMA(train['Close_diff'], order=(p, 0, 0))
-            res = model.fit()
-            aic = res.aic
-            results[f"AR({p})"] = aic
-            if aic < best_aic:
-                best_aic = aic
-                best_order = p
-                best_type = "AR"
-        except:
-            pass
-            
-    # MA(q) models for q = 1 to 5
-    for q in range(1, 6):
-        try:
-            model = ARIMA(train['Close_diff'], order=(0, 0, q))
-            res = model.fit()
-            aic = res.aic
-            results[f"MA({q})"] = aic
-            if aic < best_aic:
-                best_aic = aic
-                best_order = q
-                best_type = "MA"
-        except:
-            pass
+    # Model Selection: AR(p) and MA(q) for p, q = 1 to 5, fitted in parallel;
+    # Ljung-Box runs on every candidate's residuals in one batch
+    search = search_orders(train, ar_ma_orders(5, 5), diagnose_lags=[1])
+    best_order = search.best_order
 
     # Print AIC Values
-    for p in range(1, 6):
-        key = f"AR({p})"
-        if key in results:
-            print(f"{key} AIC: {results[key]}")
-    for q in range(1, 6):
-        key = f"MA({q})"
-        if key in results:
-            print(f"{key} AIC: {results[key]}")
+    for order, aic in search.scores.items():
+        print(f"{order_label(order)} AIC: {aic}")
             
     print()
-    print(f"Best Model: {best_type}({best_order})")
-    
-    # Fit the best model
-    if best_type == "AR":
-        final_model = ARIMA(train['Close_diff'], order=(best_order, 0, 0))
-    else:
-        final_model = ARIMA(train['Close_diff'], order=(0, 0, best_order))
+    print(f"Best Model: {order_label(best_order)}")
     
-    final_res = final_model.fit()
+    # The best model was already fitted during the search
+    final_res = search.best
     
     # Print Model Summary
-    print(final_res.summary())
+    with stage('report'):
+        print(final_res.summary())
     print()
     
     # Ljung-Box Test Results
     print("Ljung-Box Test Results:")
-    lb_results = acorr_ljungbox(final_res.resid, lags=[1], return_df=True)
-    print(lb_results)
+    print(search.diagnostics.ljung_box(best_order))
 
 if __name__ == "__main__":
     solve()
\ No newline at end of file
@@ -1,6 +1,10 @@
 import os
 import sys
 
+sys.path.append(os.path.dirname(sys.path[0]))
+from instrument import traced
+
+@traced()
 def main():
     try:
         import pandas as pd
@@ -43,14 +47,27 @@ def main():
     print("\nSARIMA Model Summary:")
     try:
         import pmdarima as pm
-        model = pm.auto_arima(train['Close'], 
+    except ImportError:
+        pm = None
+    if pm is not None:
+        model = pm.auto_arima(train['Close'],
                              seasonal=True, m=12,
-                             suppress_warnings=True, 
-                             error_action='ignore', 
+                             suppress_warnings=True,
+                             error_action='ignore',
                              stepwise=True)
         print(model.summary())
+        return
+    try:
+        # Without pmdarima: parallel SARIMAX order search on statsmodels
+        from sarima_search import sarima_search
     except ImportError:
-        print("pmdarima not available. SARIMA modeling skipped.")
+        print("statsmodels not available. SARIMA modeling skipped.")
+        return
+    search = sarima_search(train['Close'], m=12, time_budget=300)
+    if search.best is None:
+        print("No SARIMA model could be fitted within the time budget. SARIMA modeling skipped.")
+        return
+    print(search.best.summary())
 
 if __name__ == "__main__":
     main()
@@ -6,8 +6,12 @@ import warnings
 os.environ["TF_CPP_MIN_LOG_LEVEL"] = "3"
 warnings.simplefilter(action='ignore')
 
-import spacy
+sys.path.append(os.path.dirname(sys.path[0]))
+from instrument import traced
+from spacy_loader import load_model
+from stop_filter import StopWordFilter
 
+@traced()
 def solve():
     # Prompt for filename
     try:
@@ -34,7 +38,8 @@ def solve():
     
     # Load spaCy model
     try:
-        nlp = spacy.load("en_core_web_sm")
+        # Only the tokenizer is needed for stop word checks
+        nlp = load_model("tokenize")
     except Exception:
         print("SpaCy model 'en_core_web_sm' not found. Install it using:")
         print("python -m spacy download en_core_web_sm")
@@ -42,8 +47,9 @@ def solve():
     
     # Process text with default stop words
     doc = nlp(content)
-    # Using lowercase check against nlp.Defaults.stop_words for consistency
-    tokens_no_stop = [token.text for token in doc if token.text.lower() not in nlp.Defaults.stop_words and not token.is_space]
+    # Stop word sets are built per run; spaCy's global defaults are never modified
+    default_stops = StopWordFilter(nlp.Defaults.stop_words)
+    tokens_no_stop = [token.text for token in default_stops.keep(doc)]
     
     # 2. Text After Stop Word Removal (Sample) - First 50 valid tokens
     print("=== Text After Stop Word Removal (Sample) ===")
@@ -54,24 +60,20 @@ def solve():
     print("Custom stop words added: {'set', 'example', 'whenever', 'whatever'}")
     
     custom_words = {'set', 'example', 'whenever', 'whatever'}
-    for word in custom_words:
-        nlp.vocab[word].is_stop = True
-        nlp.Defaults.stop_words.add(word)
+    added_stops = default_stops.with_words(add=custom_words)
     
-    print(f"Is 'example' a stop word? {nlp.vocab['example'].is_stop}")
+    print(f"Is 'example' a stop word? {'example' in added_stops}")
     # Display the count after addition
-    print(f"Total Stop Words Now: {len(nlp.Defaults.stop_words)}")
+    print(f"Total Stop Words Now: {len(added_stops)}")
     print()
     
     # Remove 'example'
-    nlp.vocab['example'].is_stop = False
-    if 'example' in nlp.Defaults.stop_words:
-        nlp.Defaults.stop_words.remove('example')
+    custom_stops = added_stops.with_words(remove={'example'})
     
     print("Removed stop word: {'example'}")
-    print(f"Is 'example' a stop word now? {nlp.vocab['example'].is_stop}")
+    print(f"Is 'example' a stop word now? {'example' in custom_stops}")
     # Display the count after removal
-    print(f"Total Stop Words After Removal: {len(nlp.Defaults.stop_words)}")
+    print(f"Total Stop Words After Removal: {len(custom_stops)}")
     print()
     
     # 4. Stop Word Removal Examples
@@ -88,7 +90,7 @@ def solve():
         print(f"Input {i}: {ex}")
         doc_ex = nlp(ex)
         # Using updated stop words
-        filtered = [token.text for token in doc_ex if token.text.lower() not in nlp.Defaults.stop_words and not token.is_space]
+        filtered = [token.text for token in custom_stops.keep(doc_ex)]
         print(f"After Stop Word Removal: {' '.join(filtered)}")
         # No trailing blank line after the last example
         if i < len(examples):
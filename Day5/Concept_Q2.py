@@ -6,9 +6,12 @@ import warnings
 os.environ["TF_CPP_MIN_LOG_LEVEL"] = "3"
 warnings.simplefilter(action='ignore')
 
-import spacy
-from nltk.stem import SnowballStemmer
+sys.path.append(os.path.dirname(sys.path[0]))
+from instrument import traced
+from normalizer import Normalizer
+from spacy_loader import load_model
 
+@traced()
 def solve():
     # Input file name
     try:
@@ -32,12 +35,16 @@ def solve():
 
     # Load spaCy model
     try:
-        nlp = spacy.load("en_core_web_sm")
+        # Lemmatization needs the tagger but not the parser or NER
+        nlp = load_model("lemma")
     except OSError:
         print("SpaCy model 'en_core_web_sm' not found. Install it using:")
         print("python -m spacy download en_core_web_sm")
         sys.exit(1)
 
+    # Lemmas and stems are cached per word type
+    normalizer = Normalizer(nlp)
+
     # 1. Lemmatization: Individual Words
     sample_words_str = "friendship studied was am is organizing matches"
     sample_words = sample_words_str.split()
@@ -55,15 +62,13 @@ def solve():
     # organizing -> organize
     # matches -> match
     for word in sample_words:
-        token = nlp(word)[0]
-        print(f"{word} -> {token.lemma_}")
+        print(f"{word} -> {normalizer.lemma(word)}")
     print()
 
     # 2. Stemming: Individual Words
-    stemmer = SnowballStemmer(language='english')
     print("=== Stemming: Individual Words ===")
     for word in sample_words:
-        stem = stemmer.stem(word)
+        stem = normalizer.stem(word)
         print(f"{word} --> {stem}")
     print()
 
@@ -79,7 +84,7 @@ def solve():
     # 4. Stemming: Full Text
     print("=== Stemming: Full Text ===")
     for token in tokens_full[:50]:
-        stem = stemmer.stem(token.text.lower())
+        stem = normalizer.normalize_token(token)[1]
         print(f"{token.text} --> {stem}")
     print()
 
@@ -91,8 +96,7 @@ def solve():
     print("Word\t\tLemma\t\tStem")
     print("-" * 42)
     for word in practice_words:
-        lemma = nlp(word)[0].lemma_
-        stem = stemmer.stem(word)
+        lemma, stem = normalizer.normalize(word)
         print(f"{word}\t\t{lemma}\t\t{stem}")
     print()
 
@@ -1,18 +1,17 @@
 import os
 os.environ["TF_CPP_MIN_LOG_LEVEL"] = "3"
 import sys
-import spacy
 import warnings
 warnings.simplefilter(action='ignore')
 
-def solve():
-    try:
-        nlp = spacy.load("en_core_web_sm")
-    except:
-        print("SpaCy model 'en_core_web_sm' not found. Install it using:")
-        print("python -m spacy download en_core_web_sm")
-        sys.exit(1)
+sys.path.append(os.path.dirname(sys.path[0]))
+from instrument import traced
+from person_subjects import person_subjects
+from spacy_loader import load_model
+from text_stream import pipe_file, read_head
 
+@traced()
+def solve():
     # Prompt for filename
     filename = input("Enter text file name: ")
     print()
@@ -22,42 +21,32 @@ def solve():
     if not os.path.exists(file_path):
         # Even if not explicitly asked, exit if file missing
         sys.exit(1)
-        
-    with open(file_path, 'r', encoding='utf-8') as f:
-        content = f.read()
 
+    # The model is loaded only once the input file is known to exist
+    try:
+        # Subjects need the parser and NER, but not the lemmatizer
+        nlp = load_model("subject")
+    except:
+        print("SpaCy model 'en_core_web_sm' not found. Install it using:")
+        print("python -m spacy download en_core_web_sm")
+        sys.exit(1)
+        
     # 1. Original Text Sample (First 300 chars)
     print("=== Original Text Sample (First 300 chars) ===")
-    print(content[:300])
+    print(read_head(file_path, 300))
     print()
 
     # 2. Sentences with PERSON as Main Subject
     print("=== Sentences with PERSON as Main Subject ===")
     print()
 
-    doc = nlp(content)
-    for sent in doc.sents:
-        found_subject = None
-        found_verb = None
-        
-        # We need to find nsubj that is a PERSON
-        for token in sent:
-            if token.dep_ == "nsubj":
-                # Check if this token is part of a PERSON entity
-                is_person = False
-                for ent in doc.ents:
-                    if ent.label_ == "PERSON" and token.i >= ent.start and token.i < ent.end:
-                        is_person = True
-                        break
-                if is_person:
-                    found_subject = token.text
-                    found_verb = token.head.text
-                    break
-        
-        if found_subject:
+    # The file is streamed through nlp.pipe; the nsubj PERSON check uses
+    # each token's entity label instead of scanning doc.ents
+    for doc in pipe_file(nlp, file_path):
+        for sent, subject, verb in person_subjects(doc):
             print(f"Sentence : {sent.text.strip()}")
-            print(f"Subject  : {found_subject}")
-            print(f"Main Verb: {found_verb}")
+            print(f"Subject  : {subject.text}")
+            print(f"Main Verb: {verb.text}")
             print("-" * 50)
 
 if __name__ == "__main__":
@@ -7,8 +7,13 @@ os.environ["TF_CPP_MIN_LOG_LEVEL"] = "2"
 # Suppress spaCy warnings
 warnings.simplefilter(action='ignore')
 
-import spacy
+sys.path.append(os.path.dirname(sys.path[0]))
+from instrument import traced
+from itertools import chain, islice
+from spacy_loader import load_model
+from text_stream import iter_tokens, read_lines
 
+@traced()
 def solve():
     try:
         filename = input().strip()
@@ -19,25 +24,23 @@ def solve():
             sys.exit(1)
             
         try:
-            nlp = spacy.load("en_core_web_sm")
+            # POS tags need only the tagger and attribute ruler
+            nlp = load_model("pos")
         except OSError:
             print("spaCy model 'en_core_web_sm' not found.")
             print("Run: python -m spacy download en_core_web_sm")
             sys.exit(1)
             
-        with open(filepath, 'r', encoding='utf-8') as f:
-            content = f.read()
-            
         # 1. First 10 lines     
-        lines = content.splitlines()
         print("First 10 lines from the file:")
-        for line in lines[:10]:
+        for line in read_lines(filepath, 10):
             print(line) 
         print()
         
-        # 2. First 20 tokens
-        doc = nlp(content)
-        tokens = [token.text for token in doc[:20]]
+        # 2. First 20 tokens (the file is streamed through nlp.pipe in chunks)
+        stream = iter_tokens(nlp, filepath)
+        first = list(islice(stream, 20))
+        tokens = [token.text for token in first]
         print("First 20 tokens:")
         print(tokens)
         print()
@@ -46,7 +49,7 @@ def solve():
         print("POS Tagging Output:")
         print("Word\tPOS\tTag")
         print("-" * 30)
-        for token in doc:
+        for token in chain(first, stream):
             print(f"{token.text} \t {token.pos_} \t {token.tag_}")
             
     except EOFError:
@@ -3,19 +3,14 @@ os.environ["TF_CPP_MIN_LOG_LEVEL"] = "3"
 import sys
 import warnings
 warnings.simplefilter(action='ignore')
-import spacy
-from nltk.stem import SnowballStemmer
+sys.path.append(os.path.dirname(sys.path[0]))
+from instrument import traced
+from normalizer import Normalizer
+from spacy_loader import load_model
+from text_stream import iter_tokens, read_head
 
+@traced()
 def main():
-    try:
-        nlp = spacy.load("en_core_web_sm")
-    except OSError:
-        print("SpaCy model 'en_core_web_sm' not found. Install it using:")
-        print("python -m spacy download en_core_web_sm")
-        sys.exit(1)
-
-    stemmer = SnowballStemmer(language='english')
-
     try:
         filename = input("Enter text file name: ")
         print()
@@ -25,46 +20,64 @@ def main():
     file_path = os.path.join(sys.path[0], filename)
     
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
+        head = read_head(file_path, 300)
     except FileNotFoundError:
         print(f"Error: File '{filename}' not found.")
         sys.exit(1)
 
+    try:
+        # Lemmatization needs the tagger but not the parser or NER
+        nlp = load_model("lemma")
+    except OSError:
+        print("SpaCy model 'en_core_web_sm' not found. Install it using:")
+        print("python -m spacy download en_core_web_sm")
+        sys.exit(1)
+
+    # Lemmas and stems are cached per word type
+    normalizer = Normalizer(nlp)
+
     print("Original Text Sample:")
-    print(content[:300])
+    print(head)
     print()
 
-    doc = nlp(content)
-    tokens = [token for token in doc if not token.is_space]
-    print(f"Total Tokens Count: {len(tokens)}")
+    # Stream the file through nlp.pipe, keeping only the 30 tokens shown below
+    count = 0
+    sample = []
+    for token in iter_tokens(nlp, file_path):
+        if token.is_space:
+            continue
+        count += 1
+        if len(sample) < 30:
+            sample.append((token.text, token.lemma_, normalizer.normalize_token(token)[1]))
+    print(f"Total Tokens Count: {count}")
     print()
 
-    lemmas = [token.lemma_ for token in tokens]
+    tokens = [text for text, _, _ in sample]
+    lemmas = [lemma for _, lemma, _ in sample]
+    stems = [stem for _, _, stem in sample]
     print("=== Lemmatized Sample (First 20 tokens) ===")
     print(lemmas[:20])
     print()
 
     print("Word --> Lemma")
     for token, lemma in zip(tokens[:30], lemmas[:30]):
-        print(f"{token.text} --> {lemma}")
+        print(f"{token} --> {lemma}")
     print()
 
-    stems = [stemmer.stem(token.text.lower()) for token in tokens]
     print("=== Stemmed Sample (First 20 tokens) ===")
     print(stems[:20])
     print()
 
     print("Word --> Stem")
     for token, stem in zip(tokens[:30], stems[:30]):
-        print(f"{token.text} --> {stem}")
+        print(f"{token} --> {stem}")
     print()
 
     print("=== Comparison: Lemmatization vs Stemming ===")
     print("Word\t\tLemma\t\tStem")
     print("-" * 42)
     for token, lemma, stem in zip(tokens[:30], lemmas[:30], stems[:30]):
-        print(f"{token.text}\t\t{lemma}\t\t{stem}")
+        print(f"{token}\t\t{lemma}\t\t{stem}")
     print()
 
     print("Conclusion:")
@@ -1,9 +1,14 @@
 import os
 os.environ["TF_CPP_MIN_LOG_LEVEL"] = "3"
 import sys
-import spacy
-from spacy.lang.en.stop_words import STOP_WORDS
 
+sys.path.append(os.path.dirname(sys.path[0]))
+from instrument import traced
+from spacy_loader import load_model
+from stop_filter import StopWordFilter
+from text_stream import iter_tokens
+
+@traced()
 def solve():
     try:
         filename = input("Enter text file name: ")
@@ -15,27 +20,25 @@ def solve():
     if not os.path.exists(file_path):
         print("Error: File not found")
         sys.exit(1)
-        
-    try:
-        with open(file_path, 'r', encoding='utf-8') as file:
-            content = file.read()
-    except Exception:
-        print("Error: File not found")
-        sys.exit(1)
 
-    nlp = spacy.load("en_core_web_sm")
-    doc = nlp(content)
+    # Lemmas need the tagger but not the parser or NER
+    nlp = load_model("lemma")
 
-    stop_words = set(STOP_WORDS)
-    stop_words.update(["officially", "announced", "present", "run"])
-    stop_words.difference_update(["hence", "every", "he"])
+    stop_words = StopWordFilter(add=["officially", "announced", "present", "run"],
+                                remove=["hence", "every", "he"])
 
+    # Stream the file through nlp.pipe and stop once the printed samples
+    # (20 tokens, 200 characters of cleaned text) are complete
     filtered_tokens = []
-    for token in doc:
-        if (token.text.lower() not in stop_words and 
+    cleaned_len = -1
+    for token in iter_tokens(nlp, file_path):
+        if (not stop_words.is_stop(token) and 
             not token.is_punct and 
             not token.is_space):
             filtered_tokens.append(token.lemma_.lower())
+            cleaned_len += len(filtered_tokens[-1]) + 1
+            if len(filtered_tokens) >= 20 and cleaned_len >= 200:
+                break
 
     print("Filtered Tokens (First 20):")
     print(filtered_tokens[:20])
@@ -0,0 +1,229 @@
+"""Append new rows without recomputing the history.
+
+Derived columns and fitted models are carried forward from a small state
+instead of being rebuilt from the full file on every run:
+
+    derived = DerivedColumns.from_history(df, 'Close', diff='Close_diff',
+                                          sma={'SMA_10': 10, 'SMA_30': 30},
+                                          ses=('SES', 0.2))
+    new = derived.append(new_rows)        # new rows with the derived columns
+
+    tracker = ModelTracker(arima_results)          # or a HoltWintersFit
+    tracker.append(new['Close_diff'])
+    tracker.forecast(12)
+
+DerivedColumns keeps the last value and the last `window` values of the
+source column and the SES level, so a difference, a rolling mean and the
+SES fit cost O(new rows).
+
+ModelTracker moves a fitted ARIMA/SARIMAX (results.extend) or Holt-Winters
+model (HoltWintersFit.extend) forward through the Kalman filter or the
+smoothing recursions with the parameters fixed. Each append tests the
+standardized one-step errors accumulated since the last estimation for a
+shift in mean or an increase in variance. Only when that drift check
+rejects is the model re-estimated on the full history, warm-started from
+the current parameters.
+"""
+import warnings
+
+import numpy as np
+import pandas as pd
+
+
+class DerivedColumns:
+    """Difference, rolling means and SES of one source column, updated by appends.
+
+    source  -- column the others are derived from ('Close', 'Consumption')
+    diff    -- name of the first-difference column, or None
+    sma     -- {name: window} rolling means
+    ses     -- (name, alpha) one-step SES fit, or None
+    """
+
+    def __init__(self, source, diff=None, sma=None, ses=None):
+        self.source = source
+        self.diff = diff
+        self.sma = dict(sma or {})
+        self.ses = ses
+        self._tail = np.empty(0)
+        self._level = np.nan
+
+    @classmethod
+    def from_history(cls, df, source, diff=None, sma=None, ses=None):
+        """State after the rows of `df` (its derived columns are not read)."""
+        derived = cls(source, diff, sma, ses)
+        derived.append(df)
+        return derived
+
+    def _keep(self):
+        return max([1] + list(self.sma.values()))
+
+    def append(self, rows):
+        """`rows` (DataFrame with the source column) with the derived columns filled in."""
+        rows = rows.copy()
+        new = rows[self.source].to_numpy(dtype=float)
+        values = np.concatenate([self._tail, new])
+        offset = len(self._tail)
+        if self.diff:
+            rows[self.diff] = _diff(values)[offset:]
+        for name, window in self.sma.items():
+            rows[name] = _rolling_mean(values, window)[offset:]
+        if self.ses:
+            name, alpha = self.ses
+            fitted = np.empty(len(new))
+            level = self._level
+            for t, y in enumerate(new):
+                if np.isnan(level):
+                    level = y
+                fitted[t] = level
+                if not np.isnan(y):
+                    level = alpha * y + (1 - alpha) * level
+            self._level = level
+            rows[name] = fitted
+        self._tail = values[-self._keep():]
+        return rows
+
+
+def _diff(values):
+    out = np.full(len(values), np.nan)
+    out[1:] = values[1:] - values[:-1]
+    return out
+
+
+def _rolling_mean(values, window):
+    # NaN only where the window holds a missing value, like Series.rolling().
+    out = np.full(len(values), np.nan)
+    if len(values) >= window:
+        observed = ~np.isnan(values)
+        csum = np.concatenate([[0.0], np.cumsum(np.where(observed, values, 0.0))])
+        count = np.concatenate([[0], np.cumsum(observed)])
+        full = count[window:] - count[:-window] == window
+        out[window - 1:] = np.where(full, (csum[window:] - csum[:-window]) / window, np.nan)
+    return out
+
+
+def drift_pvalue(z):
+    """p-value of 'standardized errors z are N(0, 1)' against a mean shift
+    or a larger variance (Bonferroni-combined z and chi-squared tests)."""
+    from scipy import stats
+
+    z = np.asarray(z, dtype=float)
+    z = z[~np.isnan(z)]
+    if not len(z):
+        return 1.0
+    p_mean = 2 * stats.norm.sf(abs(z.mean()) * np.sqrt(len(z)))
+    p_var = stats.chi2.sf(np.sum(z * z), len(z))
+    return float(min(1.0, 2 * min(p_mean, p_var)))
+
+
+class ModelTracker:
+    """A fitted model kept current by filter-only updates.
+
+    results  -- the current statsmodels results or HoltWintersFit; after an
+                append it covers the appended rows (forecasts start after them)
+    refits   -- number of re-estimations triggered by the drift check
+    pvalue   -- drift-check p-value after the last append
+    alpha    -- re-estimate when pvalue < alpha
+    window   -- at most this many recent errors enter the drift check
+    """
+
+    def __init__(self, results, history=None, exog=None, alpha=0.01, window=24,
+                 seasonal_periods=12):
+        from holt_winters import HoltWintersFit
+
+        self.results = results
+        self.alpha = alpha
+        self.window = window
+        self.refits = 0
+        self.pvalue = 1.0
+        self._hw = isinstance(results, HoltWintersFit)
+        self._m = seasonal_periods
+        if history is None:
+            if self._hw:
+                raise ValueError("a HoltWintersFit needs the history it was fitted on")
+            history = results.model.data.orig_endog
+            exog = _user_exog(results.model) if exog is None else exog
+        self.history = history
+        self.exog = exog
+        if not self._hw:
+            # Refits rebuild the original specification; extended models
+            # carry a 'known' initialization that must not be reused.
+            self._model_class = type(results.model)
+            self._init_kwds = results.model._get_init_kwds()
+            self._init_kwds.pop('exog', None)
+        if self._hw:
+            if len(results.alpha) != 1:
+                raise ValueError("track one Holt-Winters series at a time")
+            self._sigma = _hw_sigma(results, history, window)
+        self._errors = np.empty(0)
+
+    def _standardized(self, extended, new):
+        if self._hw:
+            fitted = np.asarray(extended.fittedvalues, dtype=float).ravel()
+            return (np.asarray(new, dtype=float).ravel() - fitted) / self._sigma
+        return np.asarray(extended.standardized_forecasts_error[0], dtype=float)
+
+    def append(self, new, exog=None):
+        """Filter the model through `new` observations; re-estimate on drift.
+
+        Returns True if the parameters were re-estimated.
+        """
+        if self._hw:
+            extended = self.results.extend(new)
+        else:
+            extended = self.results.extend(new, exog=exog)
+        self.history = _concat(self.history, new)
+        if exog is not None:
+            self.exog = _concat(self.exog, exog)
+        self._errors = np.concatenate([self._errors, self._standardized(extended, new)])
+        self._errors = self._errors[-self.window:]
+        self.pvalue = drift_pvalue(self._errors)
+        if self.pvalue >= self.alpha:
+            self.results = extended
+            return False
+        self.results = self._refit(extended)
+        self.refits += 1
+        self._errors = np.empty(0)
+        return True
+
+    def _refit(self, current):
+        if self._hw:
+            from holt_winters import holt_winters
+            res = holt_winters(self.history, self._m, current.seasonal[0])
+            self._sigma = _hw_sigma(res, self.history, self.window)
+            return res
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            model = self._model_class(self.history, exog=self.exog, **self._init_kwds)
+        fit_kwargs = {'start_params': current.params}
+        if model.__class__.__name__ == 'SARIMAX':
+            fit_kwargs['disp'] = False
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            return model.fit(**fit_kwargs)
+
+    def forecast(self, steps, exog=None):
+        if self._hw:
+            return self.results.forecast(steps)
+        return self.results.forecast(steps, exog=exog)
+
+
+def _user_exog(model):
+    # ARIMA prepends its trend columns ('const') to data.orig_exog; the
+    # caller's regressors are kept in _input_exog, (n x 0) when there are none.
+    if hasattr(model, '_input_exog'):
+        exog = model._input_exog
+        return None if exog is None or exog.shape[1] == 0 else exog
+    return model.data.orig_exog
+
+
+def _hw_sigma(fit, history, window):
+    # Scale of the most recent in-sample errors: the noise level of a
+    # growing series is better judged from its end than from its whole span.
+    resid = np.asarray(history, dtype=float).ravel() - np.asarray(fit.fittedvalues).ravel()
+    return float(np.sqrt(np.mean(resid[-window:] ** 2)))
+
+
+def _concat(old, new):
+    if isinstance(old, (pd.Series, pd.DataFrame)):
+        return pd.concat([old, new])
+    return np.concatenate([np.asarray(old), np.asarray(new)])
@@ -0,0 +1,179 @@
+"""Benchmark forecasts for a whole panel of series.
+
+Naive, seasonal naive, drift, moving-average and fixed-alpha simple
+exponential smoothing, computed for every column of a (time x series)
+array with NumPy array operations. They are cheap enough to run on every
+series before anything is fitted, and an ARIMA that cannot beat them is not
+worth its fit:
+
+    scores = baseline_accuracy(train, test, season=12)   # method x series MAE
+
+Each method returns a BaselineFit with one-step-ahead in-sample
+`fittedvalues` (NaN where the method has no history yet) and
+`forecast(steps)`. Leading NaNs (series that start later) are allowed.
+Forecasts start after each column's last observation.
+"""
+import numpy as np
+import pandas as pd
+
+from panel import as_matrix, wrapper
+
+METHODS = ('naive', 'seasonal_naive', 'drift', 'moving_average', 'ses')
+
+
+class BaselineFit:
+    """In-sample fitted values and out-of-sample forecasts of one method."""
+
+    def __init__(self, name, fitted, forecaster, wrap):
+        self.name = name
+        self._fitted = fitted
+        self._forecaster = forecaster
+        self._wrap = wrap
+
+    @property
+    def fittedvalues(self):
+        return self._wrap(self._fitted)
+
+    def forecast(self, steps):
+        h = np.arange(1, steps + 1)[:, None]
+        return self._wrap(self._forecaster(h), forecast=True)
+
+
+def _prepare(data):
+    values = as_matrix(data)
+    return values, wrapper(data, values.shape[1])
+
+
+def _ends(values):
+    """Row of the first and last observation of every column."""
+    observed = ~np.isnan(values)
+    if not observed.any(axis=0).all():
+        raise ValueError("every series needs at least one observation")
+    first = observed.argmax(axis=0)
+    last = len(values) - 1 - observed[::-1].argmax(axis=0)
+    return first, last
+
+
+def _shift(values, lag):
+    out = np.full_like(values, np.nan)
+    if lag < len(values):
+        out[lag:] = values[:len(values) - lag]
+    return out
+
+
+def naive(data):
+    """Last observed value: fitted y[t-1], forecasts y[T]."""
+    values, wrap = _prepare(data)
+    _, last = _ends(values)
+    end = values[last, np.arange(values.shape[1])]
+    return BaselineFit('naive', _shift(values, 1),
+                       lambda h: np.broadcast_to(end, (len(h), len(end))).copy(), wrap)
+
+
+def seasonal_naive(data, season=12):
+    """Value one season earlier, like the Day4 notebook's `shift(12)`."""
+    values, wrap = _prepare(data)
+    _, last = _ends(values)
+    if np.any(last + 1 < season):
+        raise ValueError(f"need at least one full season ({season} observations)")
+    cols = np.arange(values.shape[1])
+
+    def forecaster(h):
+        rows = last - season + 1 + (h - 1) % season
+        return values[rows, cols]
+    return BaselineFit('seasonal_naive', _shift(values, season), forecaster, wrap)
+
+
+def drift(data):
+    """Naive plus the average change between the first and last observation."""
+    values, wrap = _prepare(data)
+    first, last = _ends(values)
+    cols = np.arange(values.shape[1])
+    end = values[last, cols]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        slope = (end - values[first, cols]) / (last - first)
+    slope = np.where(last > first, slope, 0.0)
+    return BaselineFit('drift', _shift(values, 1) + slope, lambda h: end + h * slope, wrap)
+
+
+def moving_average(data, window=3):
+    """Mean of the previous `window` observations (NaN until a full window)."""
+    values, wrap = _prepare(data)
+    _, last = _ends(values)
+    observed = ~np.isnan(values)
+    zero = np.zeros((1, values.shape[1]))
+    csum = np.vstack([zero, np.cumsum(np.where(observed, values, 0.0), axis=0)])
+    ccount = np.vstack([zero, np.cumsum(observed, axis=0)])
+    total = csum[window:] - csum[:-window]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        means = np.where(ccount[window:] - ccount[:-window] == window, total / window, np.nan)
+    # means[i] averages rows i .. i+window-1 and is the fit for row i+window.
+    fitted = np.full_like(values, np.nan)
+    fitted[window:] = means[:len(values) - window]
+    cols = np.arange(values.shape[1])
+    valid = last + 1 >= window
+    # A series shorter than the window has no mean to forecast with.
+    end = np.full(values.shape[1], np.nan)
+    end[valid] = means[last[valid] + 1 - window, cols[valid]]
+    return BaselineFit('moving_average', fitted,
+                       lambda h: np.broadcast_to(end, (len(h), len(end))).copy(), wrap)
+
+
+def ses(data, alpha=0.2, initial_level=None):
+    """Simple exponential smoothing with a fixed smoothing level.
+
+    The level starts at each series' first observation (statsmodels'
+    SimpleExpSmoothing with initialization_method='known' at that value)
+    unless initial_level is given. Missing values leave the level unchanged.
+    alpha and initial_level may be scalars or per series.
+    """
+    values, wrap = _prepare(data)
+    first, _ = _ends(values)
+    k = values.shape[1]
+    alpha = np.broadcast_to(np.asarray(alpha, dtype=float), (k,))
+    if initial_level is None:
+        level = values[first, np.arange(k)]
+    else:
+        level = np.broadcast_to(np.asarray(initial_level, dtype=float), (k,)).copy()
+    fitted = np.full_like(values, np.nan)
+    started = np.zeros(k, dtype=bool)
+    for t in range(len(values)):
+        started |= t >= first
+        fitted[t] = np.where(started, level, np.nan)
+        y = values[t]
+        level = np.where(started & ~np.isnan(y), alpha * y + (1 - alpha) * level, level)
+    return BaselineFit('ses', fitted,
+                       lambda h: np.broadcast_to(level, (len(h), k)).copy(), wrap)
+
+
+def baselines(data, season=12, window=3, alpha=0.2, methods=METHODS):
+    """{method: BaselineFit} for every method in `methods`."""
+    makers = {
+        'naive': lambda: naive(data),
+        'seasonal_naive': lambda: seasonal_naive(data, season),
+        'drift': lambda: drift(data),
+        'moving_average': lambda: moving_average(data, window),
+        'ses': lambda: ses(data, alpha),
+    }
+    return {name: makers[name]() for name in methods}
+
+
+def baseline_accuracy(train, test, season=12, window=3, alpha=0.2, metric='MAE',
+                      methods=METHODS):
+    """Out-of-sample `metric` of every baseline, as a method x series DataFrame.
+
+    test holds the observations following train, same columns. MASE is
+    scaled by the in-sample seasonal naive errors of train.
+    """
+    from forecast_metrics import accuracy
+
+    actual = np.asarray(test, dtype=float)
+    actual = actual[:, None] if actual.ndim == 1 else actual
+    insample, _ = _prepare(train)
+    rows = {}
+    for name, fit in baselines(train, season, window, alpha, methods).items():
+        forecast = np.asarray(fit.forecast(len(actual)), dtype=float).reshape(actual.shape)
+        rows[name] = accuracy(actual.T, forecast.T, axis=1,
+                              insample=insample.T, season=season)[metric]
+    columns = train.columns if isinstance(train, pd.DataFrame) else None
+    return pd.DataFrame(rows, index=columns).T.rename_axis('method')
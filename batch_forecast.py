@@ -0,0 +1,219 @@
+"""Batch mode for the Day2/Day3 ARIMA selection pipeline.
+
+Runs select (AR/MA order search) -> fit -> Ljung-Box over many series in a
+single process tree and writes one results table, instead of starting one
+interpreter per series.
+
+    python batch_forecast.py data/*.csv -o results.csv
+    python batch_forecast.py some_dir/ -o results.csv --workers 8
+    python batch_forecast.py long.csv --id-col ticker -o results.csv
+
+Input is either CSV files (one series each; a directory or glob) or a single
+long-format CSV with an ID column. A long file must keep each series' rows
+together (e.g. sorted by ID); it is read in chunks so memory stays bounded.
+"""
+import argparse
+import csv
+import glob
+import os
+import sys
+import warnings
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from csv_loader import parse_dates
+from order_search import ar_ma_orders, order_label, search_orders
+
+VALUE_COLUMNS = ('Close_diff', 'Power_Consumption_diff')
+DATE_COLUMNS = ('Date', 'Datetime', 'DATE')
+
+
+def find_column(columns, candidates, fallback=None):
+    for name in candidates:
+        if name in columns:
+            return name
+    return fallback
+
+
+def prepare_series(df, value_col=None, date_col=None):
+    """Sort by date, drop missing values and return the value column as a Series."""
+    date_col = date_col or find_column(df.columns, DATE_COLUMNS, df.columns[0])
+    value_col = value_col or find_column(df.columns, VALUE_COLUMNS)
+    if value_col is None:
+        raise ValueError(f"no value column among {VALUE_COLUMNS}")
+    df = df.assign(**{date_col: parse_dates(df[date_col])})
+    df = df.sort_values(date_col).dropna(subset=[value_col])
+    return df.set_index(date_col)[value_col]
+
+
+def store_series(path, value_col=None, date_col=None):
+    """prepare_series() for a CSV file, read from its memory-mapped series store."""
+    from series_store import open_store
+
+    store = open_store(path, date_col)
+    value_col = value_col or find_column(store.columns, VALUE_COLUMNS)
+    if value_col is None:
+        raise ValueError(f"no value column among {VALUE_COLUMNS}")
+    return store.series(value_col).sort_index(kind='stable').dropna()
+
+
+def run_pipeline(series_id, series, orders, train_ratio=0.8, lb_lag=1):
+    """Select the best order on the training split and run Ljung-Box on it."""
+    warnings.filterwarnings("ignore")
+
+    train_size = int(len(series) * train_ratio)
+    row = {
+        'series_id': series_id,
+        'train_size': train_size,
+        'test_size': len(series) - train_size,
+    }
+    # Each worker handles one series, so the order search itself stays serial.
+    search = search_orders(series[:train_size], orders, max_workers=1, diagnose_lags=[lb_lag])
+    for order, aic in search.scores.items():
+        row[f'aic_{order_label(order)}'] = aic
+    if search.best is None:
+        row['error'] = 'no candidate order could be fitted'
+        return row
+
+    lb = search.diagnostics.ljung_box(search.best_order)
+    row['best_model'] = order_label(search.best_order)
+    row['best_aic'] = search.best.aic
+    row['lb_stat'] = float(lb['lb_stat'].iloc[0])
+    row['lb_pvalue'] = float(lb['lb_pvalue'].iloc[0])
+    return row
+
+
+def run_file(path, orders, value_col=None, date_col=None, use_store=False):
+    """Worker task for one-series-per-file input: read, prepare and run."""
+    import pandas as pd
+
+    series_id = os.path.splitext(os.path.basename(path))[0]
+    try:
+        if use_store:
+            series = store_series(path, value_col, date_col)
+        else:
+            series = prepare_series(pd.read_csv(path), value_col, date_col)
+        return run_pipeline(series_id, series, orders)
+    except Exception as exc:
+        return {'series_id': series_id, 'error': repr(exc)}
+
+
+def run_frame(series_id, df, orders, value_col=None, date_col=None):
+    """Worker task for long-format input: one group of rows already in memory."""
+    try:
+        series = prepare_series(df, value_col, date_col)
+        return run_pipeline(series_id, series, orders)
+    except Exception as exc:
+        return {'series_id': series_id, 'error': repr(exc)}
+
+
+def expand_inputs(inputs):
+    """Turn directories and glob patterns into a sorted list of CSV paths."""
+    paths = []
+    for item in inputs:
+        if os.path.isdir(item):
+            paths.extend(sorted(glob.glob(os.path.join(item, '*.csv'))))
+        elif glob.has_magic(item):
+            paths.extend(sorted(glob.glob(item)))
+        else:
+            paths.append(item)
+    return paths
+
+
+def iter_long_groups(path, id_col, chunksize=100_000):
+    """Yield (series_id, frame) from a long CSV, holding one series at a time."""
+    import pandas as pd
+
+    seen = set()
+    carry = None
+    for chunk in pd.read_csv(path, chunksize=chunksize):
+        if carry is not None:
+            chunk = pd.concat([carry, chunk], ignore_index=True)
+        # Each ID must form one run of rows, within the chunk and across chunks;
+        # groupby would silently merge separate runs.
+        ids = chunk[id_col]
+        runs = ids[ids.ne(ids.shift())]
+        repeated = runs[runs.duplicated() | runs.isin(seen)]
+        if len(repeated):
+            raise ValueError(f"rows for series {repeated.iloc[0]!r} are not contiguous in {path}")
+        # The last ID in a chunk may continue into the next one.
+        tail = ids == ids.iloc[-1]
+        carry = chunk[tail]
+        for series_id, group in chunk[~tail].groupby(id_col, sort=False):
+            seen.add(series_id)
+            yield series_id, group.drop(columns=id_col)
+    if carry is not None and len(carry):
+        yield carry[id_col].iloc[0], carry.drop(columns=id_col)
+
+
+def result_fields(orders):
+    """Column order of the results table for a given candidate grid."""
+    return (['series_id', 'train_size', 'test_size', 'best_model', 'best_aic',
+             'lb_stat', 'lb_pvalue']
+            + [f'aic_{order_label(order)}' for order in orders] + ['error'])
+
+
+def run_batch(tasks, output, fields, max_workers=None, max_pending=None):
+    """Run (func, *args) tasks in a worker pool and stream rows to `output`.
+
+    At most `max_pending` tasks are in flight, so neither the inputs nor the
+    results of the whole batch are ever held in memory. Rows are written in
+    input order. Returns the number of series processed.
+    """
+    max_workers = max_workers or os.cpu_count() or 1
+    max_pending = max_pending or 4 * max_workers
+    out = sys.stdout if output == '-' else open(output, 'w', newline='')
+    writer = csv.DictWriter(out, fieldnames=fields, extrasaction='ignore')
+    writer.writeheader()
+    count = 0
+    try:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            pending = deque()
+            for func, *args in tasks:
+                pending.append(executor.submit(func, *args))
+                if len(pending) >= max_pending:
+                    writer.writerow(pending.popleft().result())
+                    count += 1
+            while pending:
+                writer.writerow(pending.popleft().result())
+                count += 1
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    return count
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Batch AR/MA selection with Ljung-Box diagnostics.")
+    parser.add_argument('inputs', nargs='+', help="CSV files, directories or glob patterns")
+    parser.add_argument('-o', '--output', default='-', help="results CSV (default: stdout)")
+    parser.add_argument('--id-col', help="treat the input as one long-format CSV keyed by this column")
+    parser.add_argument('--value-col', help="series column (default: Close_diff or Power_Consumption_diff)")
+    parser.add_argument('--date-col', help="date column (default: Date, Datetime or the first column)")
+    parser.add_argument('--max-p', type=int, default=5)
+    parser.add_argument('--max-q', type=int, default=5)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--series-store', action='store_true',
+                        help="read each file's value column from a memory-mapped store "
+                             "kept next to it (built on first use)")
+    args = parser.parse_args(argv)
+
+    orders = ar_ma_orders(args.max_p, args.max_q)
+    if args.id_col:
+        if len(args.inputs) != 1:
+            parser.error("--id-col expects exactly one long-format CSV")
+        tasks = ((run_frame, sid, group, orders, args.value_col, args.date_col)
+                 for sid, group in iter_long_groups(args.inputs[0], args.id_col))
+    else:
+        paths = expand_inputs(args.inputs)
+        if not paths:
+            parser.error("no CSV files found")
+        tasks = ((run_file, path, orders, args.value_col, args.date_col, args.series_store)
+                 for path in paths)
+
+    count = run_batch(tasks, args.output, result_fields(orders), max_workers=args.workers)
+    print(f"Processed {count} series.", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
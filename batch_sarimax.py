@@ -0,0 +1,215 @@
+"""One SARIMAX specification fitted to many aligned series.
+
+The Day4/Concept_Q4 model, SARIMAX(order=(1,0,2), seasonal_order=(0,1,1,12))
+with the festival count as regressor, run once per substation:
+
+    batch = fit_sarimax_panel(consumption, exog=festivals, order=(1, 0, 2),
+                              seasonal_order=(0, 1, 1, 12),
+                              steps=12, future_exog=festivals_next_year)
+    batch.forecast        # horizon x series
+    batch.params          # series x parameter
+
+The specification is checked and the input laid out once: the panel
+(time x series) and the regressors go into shared memory blocks that every
+worker process maps on start-up, so a task is just a column number and
+nothing but the small per-series summary is pickled back. Each worker fits
+its series and produces the forecast with get_forecast(exog=...) before
+returning.
+
+Regressors are either shared by all series, (time x k), or per series,
+(time x series x k); future_exog has the same layout with `steps` rows.
+"""
+import os
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+
+from instrument import stage
+
+_panel = {}
+
+
+class SarimaxPanel:
+    """Fitted parameters, fit statistics and forecasts of every series.
+
+    params    -- DataFrame, series x parameter
+    stats     -- DataFrame, series x (nobs, llf, aic, bic, converged, iterations)
+    forecast  -- DataFrame, horizon x series, predicted mean
+    lower, upper
+              -- DataFrames like forecast, the (1 - alpha) interval
+    errors    -- {series: exception} for series whose fit raised
+    results   -- {series: SARIMAX results} when fitted with keep_results=True
+    """
+
+    def __init__(self, names, rows, future_index, alpha):
+        self.alpha = alpha
+        self.errors = {name: row['error'] for name, row in zip(names, rows) if 'error' in row}
+        self.results = {name: row['results'] for name, row in zip(names, rows) if 'results' in row}
+        ok = [(name, row) for name, row in zip(names, rows) if 'error' not in row]
+        fitted = pd.Index([name for name, _ in ok], name='series')
+        rows = [row for _, row in ok]
+        self.params = pd.DataFrame([row['params'] for row in rows], index=fitted,
+                                   columns=rows[0]['param_names'] if rows else [])
+        self.stats = pd.DataFrame([row['stats'] for row in rows], index=fitted,
+                                  columns=['nobs', 'llf', 'aic', 'bic', 'converged', 'iterations'])
+        empty = np.empty((len(future_index), 0))
+        self.forecast, self.lower, self.upper = (
+            pd.DataFrame(np.column_stack([row[key] for row in rows]) if rows else empty,
+                         index=future_index, columns=fitted)
+            for key in ('mean', 'lower', 'upper'))
+
+
+def _share(array):
+    """Copy `array` into a new shared memory block; returns (block, spec)."""
+    block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+    np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)[...] = array
+    return block, (block.name, array.shape, array.dtype.str)
+
+
+def _attach(specs, config):
+    """Pool initializer: map the shared arrays once per worker."""
+    blocks = {}
+    for key, spec in specs.items():
+        if spec is None:
+            _panel[key] = None
+            continue
+        name, shape, dtype = spec
+        blocks[key] = shared_memory.SharedMemory(name=name)
+        _panel[key] = np.ndarray(shape, dtype=dtype, buffer=blocks[key].buf)
+    _panel['_blocks'] = blocks
+    _panel['config'] = config
+
+
+def _column_exog(exog, j):
+    if exog is None:
+        return None
+    return exog[:, j, :] if exog.ndim == 3 else exog
+
+
+def _fit_column(j):
+    """Fit series `j` of the attached panel; module level for the pool."""
+    from statsmodels.tsa.statespace.sarimax import SARIMAX
+    warnings.filterwarnings("ignore")
+
+    cfg = _panel['config']
+    y = _panel['endog'][:, j]
+    x = _column_exog(_panel['exog'], j)
+    # Leading/trailing gaps of a ragged panel are trimmed; inner ones are
+    # left for the Kalman filter to skip.
+    observed = np.flatnonzero(~np.isnan(y))
+    if not len(observed):
+        return {'error': ValueError("series has no observations")}
+    if observed[-1] != len(y) - 1 and cfg['steps']:
+        return {'error': ValueError("series ends before the panel; cannot forecast from the panel end")}
+    first = observed[0]
+    try:
+        model = SARIMAX(y[first:], exog=None if x is None else x[first:],
+                        order=cfg['order'], seasonal_order=cfg['seasonal_order'],
+                        trend=cfg['trend'], **cfg['model_kwargs'])
+        res = model.fit(disp=False, **cfg['fit_kwargs'])
+        retvals = res.mle_retvals or {}
+        row = {
+            'param_names': list(model.param_names),
+            'params': np.asarray(res.params),
+            'stats': [int(res.nobs), float(res.llf), float(res.aic), float(res.bic),
+                      retvals.get('converged'), retvals.get('iterations')],
+        }
+        if cfg['steps']:
+            fc = res.get_forecast(cfg['steps'], exog=_column_exog(_panel['future_exog'], j))
+            ci = np.asarray(fc.conf_int(alpha=cfg['alpha']))
+            row.update(mean=np.asarray(fc.predicted_mean), lower=ci[:, 0], upper=ci[:, 1])
+        else:
+            row.update(mean=np.empty(0), lower=np.empty(0), upper=np.empty(0))
+        if cfg['keep_results']:
+            row['results'] = res
+        return row
+    except Exception as exc:
+        return {'error': exc}
+
+
+def _as_exog(exog, nrows, nseries, what):
+    if exog is None:
+        return None
+    x = np.asarray(exog, dtype=float)
+    if x.ndim == 1:
+        x = x[:, None]
+    if x.ndim not in (2, 3) or x.shape[0] != nrows or (x.ndim == 3 and x.shape[1] != nseries):
+        raise ValueError(f"{what} must be ({nrows} x k) or ({nrows} x {nseries} x k), got {x.shape}")
+    return np.ascontiguousarray(x)
+
+
+def fit_sarimax_panel(endog, exog=None, order=(1, 0, 0), seasonal_order=(0, 0, 0, 0),
+                      trend=None, steps=0, future_exog=None, alpha=0.05, max_workers=None,
+                      keep_results=False, fit_kwargs=None, **model_kwargs):
+    """Fit the same SARIMAX specification to every column of `endog`.
+
+    endog        -- DataFrame or 2-D array, time x series; NaN is missing
+    exog         -- regressors, (time x k) shared or (time x series x k)
+    steps        -- forecast horizon; future_exog is then required if exog is
+    max_workers  -- process pool size; defaults to one worker per core, and
+                    1 fits serially in this process without shared memory
+    keep_results -- also return the full results objects (these are large
+                    and have to be pickled back from the workers)
+    """
+    names = list(endog.columns) if isinstance(endog, pd.DataFrame) else None
+    index = endog.index if isinstance(endog, (pd.DataFrame, pd.Series)) else None
+    y = np.asarray(endog, dtype=float)
+    if y.ndim == 1:
+        y = y[:, None]
+        names = [getattr(endog, 'name', None) or 0] if names is None else names
+    names = list(range(y.shape[1])) if names is None else names
+    nrows, nseries = y.shape
+    x = _as_exog(exog, nrows, nseries, 'exog')
+    if steps and x is not None and future_exog is None:
+        raise ValueError("forecasting a model with exog needs future_exog")
+    fx = _as_exog(future_exog, steps, nseries, 'future_exog') if steps and x is not None else None
+    if fx is not None and fx.shape[-1] != x.shape[-1]:
+        raise ValueError(f"future_exog has {fx.shape[-1]} regressors, exog has {x.shape[-1]}")
+
+    config = {'order': tuple(order), 'seasonal_order': tuple(seasonal_order), 'trend': trend,
+              'steps': int(steps), 'alpha': alpha, 'keep_results': keep_results,
+              'fit_kwargs': dict(fit_kwargs or {}), 'model_kwargs': model_kwargs}
+    arrays = {'endog': np.ascontiguousarray(y), 'exog': x, 'future_exog': fx}
+
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    max_workers = max(1, min(max_workers, nseries))
+    with stage('fit', series=nseries, workers=max_workers) as st:
+        if max_workers == 1:
+            _panel.update(arrays, config=config)
+            try:
+                rows = [_fit_column(j) for j in range(nseries)]
+            finally:
+                _panel.clear()
+        else:
+            blocks, specs = [], {}
+            try:
+                for key, array in arrays.items():
+                    if array is None:
+                        specs[key] = None
+                    else:
+                        block, specs[key] = _share(array)
+                        blocks.append(block)
+                with ProcessPoolExecutor(max_workers=max_workers, initializer=_attach,
+                                         initargs=(specs, config)) as executor:
+                    chunksize = max(1, nseries // (4 * max_workers))
+                    rows = list(executor.map(_fit_column, range(nseries), chunksize=chunksize))
+            finally:
+                for block in blocks:
+                    block.close()
+                    block.unlink()
+        st.set(failed=sum('error' in row for row in rows))
+
+    future_index = _future_index(index, nrows, steps)
+    return SarimaxPanel(names, rows, future_index, alpha)
+
+
+def _future_index(index, nrows, steps):
+    if isinstance(index, pd.DatetimeIndex):
+        freq = index.freq or (pd.infer_freq(index) if len(index) >= 3 else None)
+        if freq is not None:
+            return pd.date_range(index[-1], periods=steps + 1, freq=freq)[1:]
+    return pd.RangeIndex(nrows, nrows + steps, name='step')
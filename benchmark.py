@@ -0,0 +1,453 @@
+"""Throughput benchmarks for the shared time-series and spaCy code paths.
+
+Every (case, scale) pair runs in a fresh Python process, which records
+per-stage wall times and its peak RSS. The time-series cases start from the
+CSVs in data/, scaled up by tiling them onto a longer date range with some
+noise. The spaCy cases run on a generated corpus of the same scale, since
+no text files ship with the repo. The script_* cases run the Day1-Day6
+scripts end to end through cli.run_task on the same scaled inputs.
+
+    python benchmark.py --scales 1,10,100 --save bench.json
+    python benchmark.py --baseline bench.json     # exit code 1 on regression
+    python benchmark.py --cases holt_winters --scales 1000 --no-scale-limit
+"""
+import argparse
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+DATA = os.path.join(ROOT, 'data')
+SERIES_CSV = os.path.join(DATA, 'ML471_S2_Datafile_Concept(in).csv')
+MONTHLY_CSV = os.path.join(DATA, 'ML471_S1_Datafile_Concept.csv')
+EXOG_CSV = os.path.join(DATA, 'ML471_S4_Datafile_Concept.csv')
+DAILY_CSV = os.path.join(DATA, 'ML471_S1_Datafile_Practice.csv')
+STOCK_CSV = os.path.join(DATA, 'ML471_S2_Datafile_Practice.csv')
+
+# Seconds below which a slowdown is treated as noise.
+MIN_DELTA = 0.05
+
+
+class Stages:
+    """Wall time of named stages within one benchmark run."""
+
+    def __init__(self):
+        self.times = {}
+
+    @contextmanager
+    def stage(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.times[name] = self.times.get(name, 0.0) + time.perf_counter() - start
+
+
+def scaled_frame(path, scale, date_col, seed=0):
+    """The CSV at `path` repeated `scale` times on a continuous date range."""
+    import numpy as np
+    import pandas as pd
+    from csv_loader import load_csv
+
+    df = load_csv(path, date_col=date_col, cache=False)
+    freq = df.index.freq or pd.infer_freq(df.index) or 'D'
+    values = pd.concat([df] * scale, ignore_index=True)
+    rng = np.random.default_rng(seed)
+    numeric = values.select_dtypes('number').columns
+    if scale > 1:
+        noise = rng.normal(0, 0.01, (len(values), len(numeric))) * values[numeric].std().to_numpy()
+        values[numeric] = values[numeric] + np.nan_to_num(noise)
+    values.index = pd.date_range(df.index[0], periods=len(values), freq=freq, name=df.index.name)
+    return values
+
+
+FIRST_NAMES = ['Alice', 'Bob', 'Carol', 'David', 'Emma', 'Frank', 'Grace', 'Henry']
+VERBS = ['visited', 'studied', 'praised', 'built', 'measured', 'reported', 'explained', 'ran']
+OBJECTS = ['the power station', 'a new model', 'the quarterly report', 'several forecasts',
+           'the electricity demand', 'an old bridge', 'the village market', 'their results']
+
+
+def write_corpus(path, scale, seed=0):
+    """Roughly 50 kB of simple English per unit of scale, in paragraphs."""
+    import random
+
+    rng = random.Random(seed)
+    with open(path, 'w', encoding='utf-8') as f:
+        for _ in range(100 * scale):
+            sentences = []
+            for _ in range(rng.randint(3, 7)):
+                sentences.append(f"{rng.choice(FIRST_NAMES)} {rng.choice(VERBS)} "
+                                 f"{rng.choice(OBJECTS)} on {rng.randint(1, 28)} May.")
+            f.write(' '.join(sentences) + '\n\n')
+
+
+def bench_csv_load(stages, scale, workdir):
+    from csv_loader import load_csv
+
+    path = os.path.join(workdir, f'series_{scale}.csv')
+    scaled_frame(SERIES_CSV, scale, 'Datetime').to_csv(path)
+    with stages.stage('load_cold'):
+        load_csv(path, date_col='Datetime')
+    with stages.stage('load_cached'):
+        load_csv(path, date_col='Datetime')
+
+
+def bench_arima_search(stages, scale, workdir):
+    from order_search import ar_ma_orders, search_orders
+
+    y = scaled_frame(SERIES_CSV, scale, 'Datetime')['Power_Consumption_diff'].dropna()
+    with stages.stage('search'):
+        search_orders(y, ar_ma_orders(2, 2))
+
+
+def bench_sarima_search(stages, scale, workdir):
+    from sarima_search import sarima_search
+
+    y = scaled_frame(MONTHLY_CSV, scale, 'DATE')['Consumption'].interpolate()
+    with stages.stage('search'):
+        sarima_search(y, m=12, d=1, D=1, max_p=1, max_q=1, keep=2)
+
+
+def bench_sarimax_panel(stages, scale, workdir):
+    import numpy as np
+    import pandas as pd
+    from batch_sarimax import fit_sarimax_panel
+
+    df = pd.read_csv(EXOG_CSV, parse_dates=['Datetime'], index_col='Datetime').asfreq('MS')
+    rng = np.random.default_rng(0)
+    y = df['Consumption'].to_numpy()
+    panel = pd.DataFrame(y[:, None] * rng.uniform(0.8, 1.2, scale), index=df.index)
+    exog = df[['Festivals/Special_events']]
+    with stages.stage('fit'):
+        fit_sarimax_panel(panel.iloc[:-12], exog=exog.iloc[:-12], order=(1, 0, 2),
+                          seasonal_order=(0, 1, 1, 12), steps=12, future_exog=exog.iloc[-12:])
+
+
+def bench_decompose(stages, scale, workdir):
+    import numpy as np
+    from decompose import decompose_array
+
+    y = scaled_frame(MONTHLY_CSV, 1, 'DATE')['Consumption'].to_numpy()
+    panel = np.tile(y[:, None], (1, 10 * scale))
+    with stages.stage('decompose'):
+        decompose_array(panel, period=12)
+
+
+def bench_holt_winters(stages, scale, workdir):
+    import numpy as np
+    from holt_winters import holt_winters
+
+    y = scaled_frame(MONTHLY_CSV, 1, 'DATE')['Consumption'].interpolate().to_numpy()
+    rng = np.random.default_rng(0)
+    panel = y[:, None] * rng.uniform(0.5, 2.0, 10 * scale)
+    with stages.stage('fit'):
+        holt_winters(panel, 12, 'add')
+
+
+def bench_diagnostics(stages, scale, workdir):
+    import numpy as np
+    import scipy.stats  # noqa: F401  -- import time is not part of the case
+    from residual_diagnostics import diagnose
+
+    y = scaled_frame(SERIES_CSV, scale, 'Datetime')['Power_Consumption_diff'].dropna().to_numpy()
+    rng = np.random.default_rng(0)
+    resid = y[:, None] * rng.uniform(0.5, 2.0, 100) + rng.standard_normal((len(y), 100))
+    with stages.stage('diagnose'):
+        diagnose(resid, lags=24)
+
+
+def bench_append_refit(stages, scale, workdir):
+    import warnings
+
+    import pandas as pd
+    from statsmodels.tsa.arima.model import ARIMA
+    from statsmodels.tsa.statespace.sarimax import SARIMAX
+    from append_mode import ModelTracker
+
+    # A plain integer index, which statsmodels can extend at every scale.
+    y = scaled_frame(SERIES_CSV, scale, 'Datetime')['Power_Consumption_diff'].dropna()
+    y = pd.Series(y.to_numpy())
+    split = int(len(y) * 0.8)
+    # A level shift after the split makes the drift check refit the model.
+    shifted = y.copy()
+    shifted.iloc[split:] += 5 * y.std()
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        fits = {'arima': ARIMA(y.iloc[:split], order=(1, 0, 1)).fit(),
+                'sarimax': SARIMAX(y.iloc[:split], order=(1, 0, 1), trend='c').fit(disp=False)}
+    for name, res in fits.items():
+        tracker = ModelTracker(res)
+        with stages.stage(f'append_{name}'):
+            for start in range(split, len(y), 12):
+                tracker.append(shifted.iloc[start:start + 12])
+        if not tracker.refits:
+            raise RuntimeError(f"{name}: the level shift did not trigger a refit")
+
+
+def _bench_spacy(stages, scale, workdir, task, consume):
+    from spacy_loader import load_model
+    from text_stream import pipe_file
+
+    path = os.path.join(workdir, f'corpus_{scale}.txt')
+    if not os.path.exists(path):
+        write_corpus(path, scale)
+    with stages.stage('load_model'):
+        nlp = load_model(task)
+    with stages.stage('pipe'):
+        consume(pipe_file(nlp, path, n_process=1))
+
+
+def bench_spacy_tokenize(stages, scale, workdir):
+    _bench_spacy(stages, scale, workdir, 'tokenize', lambda docs: sum(len(doc) for doc in docs))
+
+
+def bench_spacy_lemma(stages, scale, workdir):
+    from stop_filter import StopWordFilter
+
+    stop = StopWordFilter()
+    _bench_spacy(stages, scale, workdir, 'lemma',
+                 lambda docs: sum(1 for doc in docs for _ in stop.keep(doc)))
+
+
+def bench_spacy_subjects(stages, scale, workdir):
+    from person_subjects import person_subjects
+
+    _bench_spacy(stages, scale, workdir, 'subject',
+                 lambda docs: sum(1 for doc in docs for _ in person_subjects(doc)))
+
+
+# CLI task -> (source CSV and its date column; None for the text corpus,
+# largest scale)
+SCRIPT_CASES = {
+    'stock-eda': ((DAILY_CSV, 'Date'), None),
+    'decompose': ((MONTHLY_CSV, 'DATE'), 100),
+    'ar-ma': ((SERIES_CSV, 'Datetime'), 10),
+    'order-search': ((STOCK_CSV, 'Date'), 10),
+    'identify': ((SERIES_CSV, 'Datetime'), 10),
+    'sarima': ((STOCK_CSV, 'Date'), 10),
+    'stopwords': (None, None),
+    'normalize': (None, None),
+    'subjects': (None, 100),
+    'tokens': (None, None),
+    'lemmas': (None, None),
+    'filter': (None, None),
+}
+
+
+def bench_script(task_name, stages, scale, workdir):
+    """Run a Day1-Day6 script through the CLI on a scaled input, output discarded."""
+    import contextlib
+    import cli
+    from spacy_loader import DEFAULT_MODEL
+
+    source, _ = SCRIPT_CASES[task_name]
+    if source is None:
+        import spacy
+        if not spacy.util.is_package(DEFAULT_MODEL):
+            raise OSError(f"spaCy model {DEFAULT_MODEL} is not installed")
+        path = os.path.join(workdir, f'corpus_{scale}.txt')
+        if not os.path.exists(path):
+            write_corpus(path, scale)
+    else:
+        csv_path, date_col = source
+        path = os.path.join(workdir, f'{task_name}_{scale}.csv')
+        scaled_frame(csv_path, scale, date_col).to_csv(path)
+    task = cli.TASKS[task_name]
+    error = cli.validate(task, path)
+    if error:
+        raise RuntimeError(error)
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        with stages.stage('run'):
+            code = cli.run_task(task, path)
+    if code:
+        raise RuntimeError(f"{task.script} exited with status {code}")
+
+
+def _script_case(task_name):
+    return lambda stages, scale, workdir: bench_script(task_name, stages, scale, workdir)
+
+
+# name -> (function, largest scale it runs at or None for no limit)
+CASES = {
+    'csv_load': (bench_csv_load, None),
+    'arima_search': (bench_arima_search, 100),
+    'sarima_search': (bench_sarima_search, 10),
+    'sarimax_panel': (bench_sarimax_panel, 10),
+    'decompose': (bench_decompose, None),
+    'holt_winters': (bench_holt_winters, 100),
+    'diagnostics': (bench_diagnostics, None),
+    'append_refit': (bench_append_refit, 10),
+    'spacy_tokenize': (bench_spacy_tokenize, None),
+    'spacy_lemma': (bench_spacy_lemma, None),
+    'spacy_subjects': (bench_spacy_subjects, 100),
+}
+CASES.update({f"script_{name.replace('-', '_')}": (_script_case(name), limit)
+              for name, (_, limit) in SCRIPT_CASES.items()})
+
+
+def run_case(name, scale, workdir):
+    """Run one case in this process and return its measurements."""
+    import warnings
+    warnings.filterwarnings('ignore')
+
+    func, _ = CASES[name]
+    stages = Stages()
+    start = time.perf_counter()
+    status = 'ok'
+    try:
+        func(stages, scale, workdir)
+    except (ImportError, OSError) as exc:
+        # Missing optional dependency or spaCy model.
+        status = f'skipped: {exc}'.splitlines()[0]
+    except Exception as exc:
+        status = f'error: {type(exc).__name__}: {exc}'.splitlines()[0]
+    return {
+        'case': name,
+        'scale': scale,
+        'status': status,
+        'wall': time.perf_counter() - start,
+        'peak_rss_kb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        'stages': stages.times,
+    }
+
+
+def measure(name, scale, workdir, repeat=1):
+    """Run a case `repeat` times in child processes; keep the fastest times."""
+    best = None
+    for _ in range(repeat):
+        proc = subprocess.run([sys.executable, os.path.abspath(__file__), '--worker',
+                               name, str(scale), workdir],
+                              capture_output=True, text=True, cwd=ROOT)
+        if proc.returncode != 0:
+            lines = proc.stderr.strip().splitlines() or ['no output']
+            return {'case': name, 'scale': scale, 'status': f'error: {lines[-1]}',
+                    'wall': None, 'peak_rss_kb': None, 'stages': {}}
+        result = json.loads(proc.stdout.strip().splitlines()[-1])
+        if best is None:
+            best = result
+            continue
+        best['wall'] = min(best['wall'], result['wall'])
+        best['peak_rss_kb'] = max(best['peak_rss_kb'], result['peak_rss_kb'])
+        for stage, seconds in result['stages'].items():
+            best['stages'][stage] = min(best['stages'].get(stage, seconds), seconds)
+    return best
+
+
+def environment():
+    versions = {'python': platform.python_version()}
+    for module in ('numpy', 'pandas', 'statsmodels', 'spacy'):
+        try:
+            versions[module] = __import__(module).__version__
+        except ImportError:
+            versions[module] = None
+    return {'versions': versions, 'cpu_count': os.cpu_count(), 'machine': platform.machine()}
+
+
+def compare(results, baseline, tolerance=0.25, rss_tolerance=0.25):
+    """List of regression messages against a saved run."""
+    previous = {(r['case'], r['scale']): r for r in baseline['results']}
+    regressions = []
+    for r in results:
+        base = previous.get((r['case'], r['scale']))
+        if base is None or base['status'] != 'ok':
+            continue
+        label = f"{r['case']} x{r['scale']}"
+        if r['status'] != 'ok':
+            # A case that used to run and now fails is the worst regression.
+            regressions.append(f"{label}: ok -> {r['status']}")
+            continue
+        timings = [('total', r['wall'], base['wall'])]
+        timings += [(stage, seconds, base['stages'].get(stage)) for stage, seconds in r['stages'].items()]
+        for stage, now, before in timings:
+            if before and now > before * (1 + tolerance) and now - before > MIN_DELTA:
+                regressions.append(f"{label} {stage}: {before:.3f}s -> {now:.3f}s")
+        if base['peak_rss_kb'] and r['peak_rss_kb'] > base['peak_rss_kb'] * (1 + rss_tolerance):
+            regressions.append(f"{label} peak RSS: {base['peak_rss_kb'] / 1024:.0f} MB -> "
+                               f"{r['peak_rss_kb'] / 1024:.0f} MB")
+    return regressions
+
+
+def print_result(r, baseline_by_key=None):
+    if r['status'] != 'ok':
+        print(f"{r['case']:<22}{r['scale']:>6}  {r['status']}")
+        return
+    stages = ', '.join(f'{k}={v:.3f}s' for k, v in r['stages'].items())
+    line = f"{r['case']:<22}{r['scale']:>6}  {r['wall']:8.3f}s  {r['peak_rss_kb'] / 1024:7.0f} MB  {stages}"
+    base = (baseline_by_key or {}).get((r['case'], r['scale']))
+    if base and base['status'] == 'ok':
+        line += f"  (baseline {base['wall']:.3f}s)"
+    print(line)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the time-series and spaCy code paths.")
+    parser.add_argument('--cases', default=','.join(CASES),
+                        help="comma-separated subset of: " + ', '.join(CASES))
+    parser.add_argument('--scales', default='1,10', help="e.g. 1,10,100,1000")
+    parser.add_argument('--repeat', type=int, default=1, help="runs per case, fastest kept")
+    parser.add_argument('--no-scale-limit', action='store_true',
+                        help="run every case at every scale, ignoring the per-case limits "
+                             "(slow model fits at 1000x can take hours)")
+    parser.add_argument('--save', help="write the results to this JSON file")
+    parser.add_argument('--baseline', help="compare against a JSON file from --save")
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help="allowed relative slowdown before failing (default 0.25)")
+    parser.add_argument('--rss-tolerance', type=float, default=0.25)
+    parser.add_argument('--worker', nargs=3, metavar=('CASE', 'SCALE', 'WORKDIR'),
+                        help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.worker:
+        sys.path.insert(0, ROOT)
+        name, scale, workdir = args.worker
+        print(json.dumps(run_case(name, int(scale), workdir)))
+        return 0
+
+    cases = [c.strip() for c in args.cases.split(',') if c.strip()]
+    unknown = [c for c in cases if c not in CASES]
+    if unknown:
+        parser.error(f"unknown cases: {', '.join(unknown)}")
+    scales = [int(s) for s in args.scales.split(',')]
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+    baseline_by_key = baseline and {(r['case'], r['scale']): r for r in baseline['results']}
+
+    results = []
+    with tempfile.TemporaryDirectory(prefix='nlp-bench-') as workdir:
+        for name in cases:
+            limit = CASES[name][1]
+            for scale in scales:
+                if limit is not None and scale > limit and not args.no_scale_limit:
+                    r = {'case': name, 'scale': scale, 'status': f'skipped: scale above {limit}',
+                         'wall': None, 'peak_rss_kb': None, 'stages': {}}
+                else:
+                    r = measure(name, scale, workdir, args.repeat)
+                print_result(r, baseline_by_key)
+                results.append(r)
+
+    if args.save:
+        with open(args.save, 'w', encoding='utf-8') as f:
+            json.dump({'environment': environment(), 'results': results}, f, indent=2)
+
+    if baseline is not None:
+        regressions = compare(results, baseline, args.tolerance, args.rss_tolerance)
+        if regressions:
+            print("\nRegressions:")
+            for message in regressions:
+                print("  " + message)
+            return 1
+        print("\nNo regressions against the baseline.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
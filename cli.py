@@ -0,0 +1,158 @@
+"""Single entry point for the Day1-Day6 tasks.
+
+    python cli.py decompose data/ML471_S1_Datafile_Concept.csv
+    python cli.py --profile-imports order-search data/ML471_S2_Datafile_Practice.csv
+    python cli.py --trace run.jsonl subjects story.txt
+
+The input file is checked (exists, readable, UTF-8, required CSV columns)
+with the standard library only, before pandas, statsmodels or spaCy is
+imported. The task script then runs in this process exactly as if the file
+name had been typed at its prompt, so the output is the same.
+"""
+import argparse
+import csv
+import io
+import os
+import runpy
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+
+class Task:
+    def __init__(self, script, kind, help, columns=()):
+        self.script = script
+        self.kind = kind
+        self.help = help
+        self.columns = columns
+
+
+TASKS = {
+    'stock-eda': Task('Day1/P1.py', 'csv', "preview, missing values and Close statistics",
+                      ('Date', 'Close')),
+    'decompose': Task('Day2/Concept_Q1.py', 'csv', "additive and multiplicative decomposition",
+                      ('DATE', 'Consumption')),
+    'ar-ma': Task('Day2/Concept_Q2.py', 'csv', "AR(2) and MA(1) summaries",
+                  ('Datetime', 'Power_Consumption_diff')),
+    'order-search': Task('Day2/solution.py', 'csv', "AR/MA order search on Close_diff",
+                         ('Close_diff',)),
+    'identify': Task('Day3/Concept_Q1.py', 'csv', "AR/MA order search on Power_Consumption_diff",
+                     ('Datetime', 'Power_Consumption_diff')),
+    'sarima': Task('Day4/Practice_Q2.py', 'csv', "seasonal ARIMA search on Close", ('Close',)),
+    'stopwords': Task('Day5/Concept_Q1.py', 'text', "stop-word removal"),
+    'normalize': Task('Day5/Concept_Q2.py', 'text', "lemmatization and stemming"),
+    'subjects': Task('Day5/Practice_Q1.py', 'text', "sentences with a PERSON subject"),
+    'tokens': Task('Day5/Practice_Q2.py', 'text', "tokenization"),
+    'lemmas': Task('Day5/Practice_Q3.py', 'text', "lemmas versus stems"),
+    'filter': Task('Day6/Practice_Q4.py', 'text', "stop-word filtering of the first tokens"),
+}
+
+
+def validate(task, path):
+    """Error message for an unusable input file, or None."""
+    if not os.path.isfile(path):
+        return f"file not found: {path}"
+    try:
+        with open(path, 'r', encoding='utf-8', newline='') as f:
+            if task.kind == 'csv':
+                header = next(csv.reader(f), None)
+            else:
+                f.read(64 * 1024)
+    except UnicodeDecodeError:
+        return f"not a UTF-8 text file: {path}"
+    except OSError as exc:
+        return f"cannot read {path}: {exc.strerror}"
+    if task.kind == 'csv':
+        if not header:
+            return f"empty CSV file: {path}"
+        missing = [c for c in task.columns if c not in header]
+        if missing:
+            return f"{os.path.basename(path)} lacks column(s): {', '.join(missing)}"
+    return None
+
+
+def run_task(task, path):
+    """Run the task script in this process with `path` as its typed input."""
+    script = os.path.join(ROOT, task.script)
+    saved = sys.argv, sys.stdin, list(sys.path)
+    sys.argv = [script]
+    sys.path[0:0] = [os.path.dirname(script)]
+    sys.stdin = io.StringIO(os.path.abspath(path) + '\n')
+    try:
+        runpy.run_path(script, run_name='__main__')
+    except SystemExit as exc:
+        return exc.code if isinstance(exc.code, int) else (0 if exc.code is None else 1)
+    finally:
+        sys.argv, sys.stdin, sys.path[:] = saved
+    return 0
+
+
+def import_profile(stderr_text, top=15):
+    """Summarize `python -X importtime` output: the slowest top-level imports.
+
+    Returns (total seconds, [(cumulative seconds, module), ...]) and the
+    remaining, non-profile stderr lines.
+    """
+    rows, other = [], []
+    for line in stderr_text.splitlines():
+        if not line.startswith('import time:'):
+            other.append(line)
+            continue
+        parts = line[len('import time:'):].split('|')
+        if len(parts) != 3 or not parts[0].strip().isdigit():
+            continue
+        name = parts[2]
+        # Nested imports are indented by two more spaces per level; keep the
+        # top-level ones, whose cumulative time includes their dependencies.
+        if len(name) - len(name.lstrip(' ')) > 1:
+            continue
+        rows.append((int(parts[1]) / 1e6, name.strip()))
+    total = sum(seconds for seconds, _ in rows)
+    rows.sort(reverse=True)
+    return total, rows[:top], other
+
+
+def profile(argv, top):
+    """Re-run this CLI under -X importtime and print where start-up time goes."""
+    cmd = [sys.executable, '-X', 'importtime', os.path.abspath(__file__)] + argv
+    proc = subprocess.run(cmd, stdout=sys.stdout, stderr=subprocess.PIPE, text=True)
+    total, rows, other = import_profile(proc.stderr, top)
+    if other:
+        print('\n'.join(other), file=sys.stderr)
+    print(f"\nImport time: {total:.3f}s total; slowest top-level imports:", file=sys.stderr)
+    for seconds, name in rows:
+        print(f"  {seconds:8.3f}s  {name}", file=sys.stderr)
+    return proc.returncode
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    parser = argparse.ArgumentParser(description="Run the time-series and text tasks.")
+    parser.add_argument('--profile-imports', action='store_true',
+                        help="print the slowest imports to stderr after the run")
+    parser.add_argument('--top', type=int, default=15, help="imports listed by --profile-imports")
+    parser.add_argument('--trace', metavar='FILE',
+                        help="write stage timings as JSON lines ('-' for stderr)")
+    sub = parser.add_subparsers(dest='task', required=True, metavar='TASK')
+    for name, task in TASKS.items():
+        p = sub.add_parser(name, help=task.help, description=f"{task.help} ({task.script})")
+        p.add_argument('file', help="input CSV file" if task.kind == 'csv' else "input text file")
+    args = parser.parse_args(argv)
+
+    task = TASKS[args.task]
+    error = validate(task, args.file)
+    if error:
+        print(f"error: {error}", file=sys.stderr)
+        return 2
+
+    if args.profile_imports:
+        rest = ['--trace', args.trace] if args.trace else []
+        return profile(rest + [args.task, args.file], args.top)
+    if args.trace:
+        os.environ['NLP_TRACE'] = args.trace
+    return run_task(task, args.file)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
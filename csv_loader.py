@@ -0,0 +1,182 @@
+"""CSV loading with one-time date-format detection and a parsed-data cache.
+
+The date formats differ between the data files (`01-01-1988`, `1/3/2006`,
+`2006-01-31 00:00:00`, ...). Letting pd.to_datetime infer them row by row is
+slow on long histories, so load_csv() detects the format once from a sample
+and parses the whole column with that explicit format.
+
+The parsed DataFrame is cached next to the CSV (Parquet when pyarrow is
+installed, pickle otherwise). The cache is reused while the CSV's size and
+modification time and the loader options are unchanged.
+"""
+import json
+import os
+
+import pandas as pd
+
+from instrument import stage
+
+DATE_COLUMNS = ('Date', 'Datetime', 'DATE')
+
+# Month-first before day-first, as pd.to_datetime does by default.
+DATE_FORMATS = (
+    '%Y-%m-%d %H:%M:%S',
+    '%Y-%m-%d',
+    '%Y-%m-%dT%H:%M:%S',
+    '%Y/%m/%d',
+    '%m/%d/%Y',
+    '%d/%m/%Y',
+    '%m-%d-%Y',
+    '%d-%m-%Y',
+    '%m/%d/%Y %H:%M',
+    '%d/%m/%Y %H:%M',
+    '%d.%m.%Y',
+)
+SAMPLE_SIZE = 500
+CACHE_VERSION = 1
+
+
+def detect_date_format(values, dayfirst=None):
+    """Return the first format in DATE_FORMATS that parses a sample of `values`.
+
+    When both a month-first and a day-first format fit (every day <= 12),
+    dayfirst=True picks the day-first one. Returns None if nothing fits.
+    """
+    values = pd.Series(values).dropna().astype(str)
+    if len(values) > 2 * SAMPLE_SIZE:
+        values = pd.concat([values.head(SAMPLE_SIZE), values.tail(SAMPLE_SIZE)])
+    if values.empty:
+        return None
+    formats = DATE_FORMATS
+    if dayfirst:
+        formats = sorted(formats, key=lambda fmt: not fmt.startswith('%d'))
+    for fmt in formats:
+        try:
+            pd.to_datetime(values, format=fmt)
+        except (ValueError, TypeError):
+            continue
+        return fmt
+    return None
+
+
+def parse_dates(values, date_format=None, dayfirst=None):
+    """pd.to_datetime with an explicit (detected if not given) format.
+
+    Falls back to pandas' own inference when no known format fits the whole
+    column.
+    """
+    if date_format is None:
+        date_format = detect_date_format(values, dayfirst)
+    if date_format is not None:
+        try:
+            return pd.to_datetime(values, format=date_format)
+        except (ValueError, TypeError):
+            pass
+    return pd.to_datetime(values, dayfirst=bool(dayfirst))
+
+
+def set_frequency(df, freq='infer'):
+    """Attach a frequency to a DatetimeIndex.
+
+    freq='infer' sets the inferred frequency when the index is regular and
+    leaves the rows alone; an explicit alias such as 'MS' calls df.asfreq().
+    """
+    if freq is None or not isinstance(df.index, pd.DatetimeIndex):
+        return df
+    if freq != 'infer':
+        return df.asfreq(freq)
+    if len(df) >= 3 and df.index.is_monotonic_increasing:
+        inferred = pd.infer_freq(df.index)
+        if inferred is not None:
+            df.index.freq = inferred
+    return df
+
+
+def _cache_paths(path):
+    try:
+        import pyarrow  # noqa: F401
+        data = path + '.parquet'
+    except ImportError:
+        data = path + '.pkl'
+    return data, path + '.cache.json'
+
+
+def _read_cache(path, key):
+    data_path, meta_path = _cache_paths(path)
+    try:
+        with open(meta_path, 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+        if meta.get('key') != key or not os.path.exists(data_path):
+            return None
+        if data_path.endswith('.parquet'):
+            return pd.read_parquet(data_path)
+        return pd.read_pickle(data_path)
+    except Exception:
+        # A truncated or foreign file (UnpicklingError, EOFError,
+        # AttributeError, ArrowInvalid, ...) is just a cache miss.
+        return None
+
+
+def _write_cache(path, key, df):
+    data_path, meta_path = _cache_paths(path)
+    # Written under per-process temporary names and moved into place, so
+    # parallel workers never read a partly written file.
+    suffix = f'.{os.getpid()}.tmp'
+    try:
+        if data_path.endswith('.parquet'):
+            df.to_parquet(data_path + suffix)
+        else:
+            df.to_pickle(data_path + suffix)
+        os.replace(data_path + suffix, data_path)
+        with open(meta_path + suffix, 'w', encoding='utf-8') as f:
+            json.dump({'key': key}, f)
+        os.replace(meta_path + suffix, meta_path)
+    except (OSError, ValueError, ImportError):
+        # A read-only data directory just means no cache.
+        for tmp in (data_path + suffix, meta_path + suffix):
+            if os.path.exists(tmp):
+                os.remove(tmp)
+
+
+def load_csv(path, date_col=None, date_format=None, dayfirst=None, dtype=None,
+             usecols=None, index=True, freq='infer', cache=True):
+    """Read `path` with its date column parsed in one explicit-format pass.
+
+    date_col   -- defaults to Date, Datetime or DATE, else the first column,
+                  as the scripts do; False skips date handling
+    dtype      -- column -> dtype map passed to read_csv
+    index      -- set the date column as the index
+    freq       -- see set_frequency(); only applied to a date index
+    cache      -- reuse / write the parsed-data cache next to the CSV
+    """
+    if date_col is None:
+        header = pd.read_csv(path, nrows=0).columns
+        date_col = next((c for c in DATE_COLUMNS if c in header), header[0])
+
+    with stage('load', path=os.path.basename(path)) as st:
+        df = _read(path, date_col, date_format, dayfirst, dtype, usecols, index, cache, st)
+        st.record_rows(df)
+    return set_frequency(df, freq) if index and date_col else df
+
+
+def _read(path, date_col, date_format, dayfirst, dtype, usecols, index, cache, st):
+    key = None
+    if cache:
+        stat = os.stat(path)
+        options = [date_col, date_format, dayfirst, dtype and sorted((k, str(v)) for k, v in dtype.items()),
+                   usecols and list(usecols), index]
+        key = [CACHE_VERSION, stat.st_size, stat.st_mtime_ns, repr(options)]
+        df = _read_cache(path, key)
+        st.set(cache='hit' if df is not None else 'miss')
+        if df is not None:
+            return df
+
+    with stage('parse'):
+        df = pd.read_csv(path, dtype=dtype, usecols=usecols)
+        if date_col:
+            df[date_col] = parse_dates(df[date_col], date_format, dayfirst)
+            if index:
+                df = df.set_index(date_col)
+    if cache:
+        _write_cache(path, key, df)
+    return df
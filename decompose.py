@@ -0,0 +1,131 @@
+"""Vectorized seasonal decomposition of many aligned series at once.
+
+Reproduces statsmodels' `seasonal_decompose` (centered moving-average trend,
+no trend extrapolation) for a whole matrix of series, time along axis 0 and
+one column per series. The trend is computed once and both the additive and
+the multiplicative components are derived from it. The Day2 preprocessing
+(mean imputation, then IQR clipping) runs in the same pass.
+"""
+import numpy as np
+import pandas as pd
+
+from instrument import stage
+
+
+class Components:
+    """One decomposition, with the attribute names of statsmodels' DecomposeResult."""
+
+    def __init__(self, observed, trend, seasonal, resid):
+        self.observed = observed
+        self.trend = trend
+        self.seasonal = seasonal
+        self.resid = resid
+
+
+def preprocess(values, impute=True, iqr_clip=1.5):
+    """Fill NaNs with each column's mean, then clip to [Q1 - k*IQR, Q3 + k*IQR].
+
+    Quantiles are taken after imputation, as in Day2/Concept_Q1. Returns a
+    new float array.
+    """
+    x = np.array(values, dtype=float)
+    if impute:
+        means = np.nanmean(x, axis=0)
+        x = np.where(np.isnan(x), means, x)
+    if iqr_clip is not None:
+        q1, q3 = np.nanquantile(x, [0.25, 0.75], axis=0)
+        iqr = q3 - q1
+        x = np.clip(x, q1 - iqr_clip * iqr, q3 + iqr_clip * iqr)
+    return x
+
+
+def moving_average_trend(x, period):
+    """Centered moving average of every column, NaN where the window is incomplete.
+
+    An even period uses the 2 x period filter with half weights at both ends,
+    like statsmodels. Computed from cumulative sums, so the cost does not
+    depend on the period.
+    """
+    n = x.shape[0]
+    half = period // 2
+    trend = np.full(x.shape, np.nan)
+    if n <= 2 * half:
+        return trend
+    csum = np.concatenate([np.zeros((1,) + x.shape[1:]), np.cumsum(x, axis=0)])
+    t = np.arange(half, n - half)
+    if period % 2:
+        total = csum[t + half + 1] - csum[t - half]
+    else:
+        total = (csum[t + half] - csum[t - half + 1]) + 0.5 * (x[t - half] + x[t + half])
+    trend[half:n - half] = total / period
+    return trend
+
+
+def _seasonal(detrended, period, multiplicative):
+    n = detrended.shape[0]
+    averages = np.array([np.nanmean(detrended[i::period], axis=0) for i in range(period)])
+    if multiplicative:
+        averages = averages / np.mean(averages, axis=0)
+    else:
+        averages = averages - np.mean(averages, axis=0)
+    reps = n // period + 1
+    return np.tile(averages, (reps,) + (1,) * (averages.ndim - 1))[:n]
+
+
+def decompose_array(values, period=12, impute=True, iqr_clip=1.5):
+    """Decompose a (time x series) array; returns (additive, multiplicative).
+
+    Columns with a non-positive value get NaN multiplicative components,
+    where statsmodels would refuse to decompose them. With impute=False the
+    input must not contain NaNs.
+    """
+    with stage('preprocess') as st:
+        x = preprocess(values, impute, iqr_clip)
+        st.record_rows(x)
+    with stage('decompose', series=x.shape[1] if x.ndim > 1 else 1):
+        return _components(x, period)
+
+
+def _components(x, period):
+    trend = moving_average_trend(x, period)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        add_seasonal = _seasonal(x - trend, period, multiplicative=False)
+        add_resid = x - trend - add_seasonal
+
+        positive = np.all(x > 0, axis=0)
+        mul_seasonal = _seasonal(x / trend, period, multiplicative=True)
+        mul_resid = x / mul_seasonal / trend
+    mul_seasonal = np.where(positive, mul_seasonal, np.nan)
+    mul_resid = np.where(positive, mul_resid, np.nan)
+
+    return (Components(x, trend, add_seasonal, add_resid),
+            Components(x, trend, mul_seasonal, mul_resid))
+
+
+def _wrap(components, like):
+    if isinstance(like, pd.Series):
+        return Components(*(pd.Series(values[:, 0], index=like.index, name=name)
+                            for values, name in [(components.observed, like.name),
+                                                 (components.trend, 'trend'),
+                                                 (components.seasonal, 'seasonal'),
+                                                 (components.resid, 'resid')]))
+    return Components(*(pd.DataFrame(values, index=like.index, columns=like.columns)
+                        for values in (components.observed, components.trend,
+                                       components.seasonal, components.resid)))
+
+
+def decompose(data, period=12, impute=True, iqr_clip=1.5):
+    """Additive and multiplicative decomposition of a Series, DataFrame or array.
+
+    A Series gives Series components named like statsmodels' output, a
+    DataFrame gives one column per series, an array gives arrays.
+    """
+    if isinstance(data, pd.Series):
+        values = data.to_numpy(dtype=float)[:, None]
+    elif isinstance(data, pd.DataFrame):
+        values = data.to_numpy(dtype=float)
+    else:
+        return decompose_array(data, period, impute, iqr_clip)
+    additive, multiplicative = decompose_array(values, period, impute, iqr_clip)
+    return _wrap(additive, data), _wrap(multiplicative, data)
@@ -0,0 +1,90 @@
+"""Forecast-accuracy metrics for whole arrays of forecasts.
+
+`actual` and `forecast` may have any (broadcastable) shape, typically
+series x origins x horizons; every metric is computed in one NumPy pass and
+averaged over the requested axes:
+
+    accuracy(actual, forecast)                 # one number per metric
+    accuracy(actual, forecast, axis=(0, 1))    # per horizon
+    accuracy(actual, forecast, axis=1, insample=train, season=12)
+
+Conventions:
+    error  is forecast - actual, so a positive bias means over-forecasting
+    NaN in either array marks a missing cell and is left out everywhere
+    MAPE skips zero actuals (the masked MAPE of Day3/Concept_Q3) and is NaN
+         when every actual is zero; MAPE and sMAPE are percentages
+    sMAPE uses (|actual| + |forecast|) / 2 and skips cells where both are 0
+    MASE scales errors by the in-sample mean absolute seasonal difference
+"""
+import numpy as np
+import pandas as pd
+
+METRICS = ('MAE', 'RMSE', 'MAPE', 'sMAPE', 'MASE', 'bias')
+
+
+def naive_scale(insample, season=1):
+    """Mean absolute `season`-step difference along the last axis of `insample`."""
+    y = np.asarray(insample, dtype=float)
+    if y.shape[-1] <= season:
+        raise ValueError(f"in-sample data needs more than {season} observations")
+    return np.nanmean(np.abs(y[..., season:] - y[..., :-season]), axis=-1)
+
+
+def _mean(values, mask, axis):
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return values.sum(axis=axis) / mask.sum(axis=axis)
+
+
+def accuracy(actual, forecast, axis=None, insample=None, season=1):
+    """MAE, RMSE, MAPE, sMAPE, MASE and bias of `forecast` against `actual`.
+
+    axis      -- axes averaged over (None: all of them)
+    insample  -- training data for MASE; its last axis is time and its
+                 leading axes line up with the leading axes of `actual`
+                 (e.g. series x time for series x origins x horizons).
+                 Without it MASE is NaN.
+    season    -- difference lag of the MASE scale (1: naive forecast)
+
+    Returns {metric: array (or float)} in METRICS order.
+    """
+    actual, forecast = np.broadcast_arrays(np.asarray(actual, dtype=float),
+                                           np.asarray(forecast, dtype=float))
+    valid = ~(np.isnan(actual) | np.isnan(forecast))
+    error = np.where(valid, forecast - actual, 0.0)
+    abs_error = np.abs(error)
+    abs_actual = np.abs(actual)
+    zeros = np.zeros_like(error)
+
+    nonzero = valid & (abs_actual != 0)
+    ape = np.divide(abs_error, abs_actual, out=zeros.copy(), where=nonzero)
+    denom = abs_actual + np.abs(forecast)
+    both = valid & (denom != 0)
+    sape = np.divide(abs_error, denom, out=zeros.copy(), where=both)
+
+    out = {
+        'MAE': _mean(abs_error, valid, axis),
+        'RMSE': np.sqrt(_mean(error * error, valid, axis)),
+        'MAPE': _mean(ape, nonzero, axis) * 100,
+        'sMAPE': _mean(sape, both, axis) * 200,
+    }
+    if insample is None:
+        out['MASE'] = out['MAE'] * np.nan
+    else:
+        scale = np.asarray(naive_scale(insample, season), dtype=float)
+        scale = scale.reshape(scale.shape + (1,) * (actual.ndim - scale.ndim))
+        with np.errstate(invalid='ignore', divide='ignore'):
+            out['MASE'] = _mean(abs_error / scale, valid, axis)
+    out['bias'] = _mean(error, valid, axis)
+    return out
+
+
+def accuracy_frame(actual, forecast, axis=0, index=None, metrics=METRICS, **kwargs):
+    """accuracy() reduced to one dimension, as a DataFrame with one column per metric.
+
+    For (origins x horizons) arrays the default axis=0 gives one row per horizon.
+    """
+    result = accuracy(actual, forecast, axis=axis, **kwargs)
+    data = {name: np.atleast_1d(result[name]) for name in metrics}
+    if index is None:
+        index = pd.RangeIndex(len(next(iter(data.values()))))
+    return pd.DataFrame(data, index=index)
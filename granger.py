@@ -0,0 +1,121 @@
+"""Granger-causality F-tests for many (target, driver, lag) combinations.
+
+Computes the same ssr-based F-test as statsmodels' `grangercausalitytests`
+(params_ftest / ssr_ftest) without printing anything. The result is a tidy
+DataFrame, so nothing has to be scraped from verbose output.
+
+The lagged design matrices are built once at `maxlag` and sliced for every
+smaller lag. The restricted regression (target on its own lags) does not
+depend on the driver, so it is solved once per target and lag and shared by
+every driver with the same usable rows. (target, group of drivers) tasks are
+spread over a worker pool.
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+COLUMNS = ['target', 'driver', 'lag', 'f_stat', 'p_value', 'df_num', 'df_denom', 'nobs']
+
+
+def lag_matrix(x, maxlag):
+    """(n, maxlag) array whose column k-1 is x shifted by k (NaN-padded)."""
+    x = np.asarray(x, dtype=float)
+    out = np.full((len(x), maxlag), np.nan)
+    for k in range(1, maxlag + 1):
+        out[k:, k - 1] = x[:-k]
+    return out
+
+
+def _ssr(X, y):
+    beta, _, _, _ = np.linalg.lstsq(X, y, rcond=None)
+    resid = y - X @ beta
+    return resid @ resid
+
+
+def _target_rows(target_name, y, drivers, maxlag):
+    """Rows of the tidy table for one target against every driver column."""
+    from scipy import stats
+
+    rows = []
+    # Lags are taken on the full aligned series, so a gap is never bridged;
+    # rows whose target or any lag used is missing are then dropped.
+    ylags = lag_matrix(y, maxlag)
+    y_ok = ~np.isnan(y)[:, None] & ~np.isnan(ylags)
+    restricted = {}
+    for driver_name, x in drivers.items():
+        if driver_name == target_name:
+            continue
+        xlags = lag_matrix(x, maxlag)
+        ok = y_ok & ~np.isnan(xlags)
+        for lag in range(1, maxlag + 1):
+            valid = ok[:, :lag].all(axis=1)
+            nobs = int(valid.sum())
+            df_denom = nobs - 2 * lag - 1
+            if df_denom <= 0:
+                break
+            const = np.ones((nobs, 1))
+            target = y[valid]
+            # The restricted fit depends on the driver only through the rows used.
+            key = (lag, valid.tobytes())
+            if key not in restricted:
+                X_r = np.hstack([ylags[valid, :lag], const])
+                restricted[key] = _ssr(X_r, target)
+            X_u = np.hstack([ylags[valid, :lag], xlags[valid, :lag], const])
+            ssr_u = _ssr(X_u, target)
+            f_stat = (restricted[key] - ssr_u) / lag / (ssr_u / df_denom)
+            rows.append((target_name, driver_name, lag, f_stat,
+                         stats.f.sf(f_stat, lag, df_denom), lag, df_denom, nobs))
+    return rows
+
+
+def granger_matrix(data, targets, drivers=None, maxlag=12, max_workers=None):
+    """F-test p-values for whether each driver Granger-causes each target.
+
+    data     -- DataFrame with one column per series, aligned in time
+    targets  -- column name or list of names to explain
+    drivers  -- candidate causes; default every other column
+    max_workers -- process pool size, default one per core; 1 runs serially
+    Lags are built on the aligned series; for each pair and lag, rows where
+    the target or any lag of either series is missing are dropped.
+    """
+    if isinstance(targets, str):
+        targets = [targets]
+    if drivers is None:
+        drivers = [c for c in data.columns if c not in targets]
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+
+    # Enough driver groups per target to keep every worker busy; within a
+    # group the restricted regressions are shared.
+    n_groups = 1
+    if max_workers > 1:
+        n_groups = max(1, min(len(drivers), -(-max_workers * 4 // len(targets))))
+    groups = [drivers[i::n_groups] for i in range(n_groups)]
+    tasks = []
+    for t in targets:
+        y = data[t].to_numpy(dtype=float)
+        for group in groups:
+            tasks.append((t, y, {name: data[name].to_numpy(dtype=float) for name in group}, maxlag))
+
+    if max_workers == 1 or len(tasks) == 1:
+        chunks = [_target_rows(*task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=min(max_workers, len(tasks))) as executor:
+            chunks = list(executor.map(_target_rows, *zip(*tasks)))
+
+    rows = [row for chunk in chunks for row in chunk]
+    position = {name: i for i, name in enumerate(drivers)}
+    rows.sort(key=lambda row: (targets.index(row[0]), position[row[1]], row[2]))
+    return pd.DataFrame(rows, columns=COLUMNS)
+
+
+def pvalue_table(results, lag=None):
+    """Pivot to one row per driver and one column per target.
+
+    With lag=None each cell holds the smallest p-value over all lags.
+    """
+    if lag is not None:
+        results = results[results['lag'] == lag]
+    return results.pivot_table(index='driver', columns='target', values='p_value', aggfunc='min')
@@ -0,0 +1,202 @@
+"""Vectorized Holt-Winters smoothing for many aligned series.
+
+Runs the additive-trend Holt-Winters recursions (additive or multiplicative
+seasonality) over a (time x series) array, one NumPy step per time point for
+all series and parameter candidates together. It replaces a Python-level
+statsmodels `ExponentialSmoothing(...).fit()` per series.
+
+The initial states are the classical 'simple' ones:
+
+    level0   = mean(y[:m])
+    trend0   = mean(y[m:2m] - y[:m]) / m
+    season0  = y[:m] - level0          (additive)
+               y[:m] / level0          (multiplicative)
+
+Given those states and the same smoothing parameters, the recursions match
+statsmodels.tsa.holtwinters.ExponentialSmoothing(trend='add', ...) fitted
+with `initialization_method='known'` and initial_level, initial_trend and
+initial_seasonal from initial_states().
+
+Smoothing parameters are estimated per series by minimizing the in-sample
+SSE. A coarse grid comes first, then a pattern search that shrinks its step
+every round, with every series and candidate evaluated in the same pass.
+"""
+import numpy as np
+
+from panel import as_matrix, wrapper
+
+# Candidate x column cells evaluated per pass of the parameter search.
+SEARCH_CELLS = 1 << 18
+
+
+class HoltWintersFit:
+    """Fitted Holt-Winters models, one column per series.
+
+    alpha, beta, gamma -- smoothing parameters per series
+    fittedvalues       -- one-step-ahead in-sample predictions
+    sse                -- in-sample sum of squared errors per series
+    """
+
+    def __init__(self, alpha, beta, gamma, fittedvalues, sse, level, trend, season,
+                 multiplicative, wrap):
+        self.alpha = alpha
+        self.beta = beta
+        self.gamma = gamma
+        self.sse = sse
+        self._fitted = fittedvalues
+        self._level = level
+        self._trend = trend
+        self._season = season
+        self._mul = multiplicative
+        self._wrap = wrap
+
+    @property
+    def fittedvalues(self):
+        return self._wrap(self._fitted)
+
+    @property
+    def seasonal(self):
+        """'add' or 'mul' per series."""
+        return ['mul' if m else 'add' for m in np.broadcast_to(self._mul, self.alpha.shape)]
+
+    def forecast(self, steps):
+        """Out-of-sample forecasts for the next `steps` periods.
+
+        Uses the textbook seasonal index, so step m draws on the last updated
+        seasonal state; statsmodels reuses the one a cycle older there.
+        """
+        m = self._season.shape[0]
+        h = np.arange(1, steps + 1)[:, None]
+        base = self._level + h * self._trend
+        season = self._season[(h[:, 0] - 1) % m]
+        values = np.where(self._mul, base * season, base + season)
+        return self._wrap(values, forecast=True)
+
+    def extend(self, data):
+        """Run the recursions over observations that follow the fitted ones.
+
+        The smoothing parameters are kept; only the states move on. The
+        returned fit's fittedvalues and sse cover the new observations only.
+        """
+        values = as_matrix(data)
+        if values.shape[1] != len(self.alpha):
+            raise ValueError(f"expected {len(self.alpha)} series, got {values.shape[1]}")
+        fitted, sse, level, trend, season = _run(values, self.alpha, self.beta, self.gamma,
+                                                 self._level, self._trend, self._season,
+                                                 self._mul)
+        return HoltWintersFit(self.alpha, self.beta, self.gamma, fitted, sse, level, trend,
+                              season, self._mul, wrapper(data, values.shape[1]))
+
+
+def initial_states(y, m, multiplicative):
+    """'simple' initial level, trend and seasonal states for every column of y."""
+    level = y[:m].mean(axis=0)
+    trend = (y[m:2 * m] - y[:m]).mean(axis=0) / m
+    season = np.where(multiplicative, y[:m] / level, y[:m] - level)
+    return level, trend, season
+
+
+def _run(y, alpha, beta, gamma, level, trend, season, multiplicative, keep_fitted=True):
+    """One pass of the recursions; every argument broadcasts over columns.
+
+    season has shape (m, ...) and holds s[t-m] .. s[t-1] in ring order.
+    Returns fitted values, SSE and the final states. With keep_fitted=False
+    the fitted values are not stored (None is returned) and the SSE is
+    accumulated step by step instead.
+    """
+    n, m = y.shape[0], season.shape[0]
+    shape = np.broadcast(alpha, level, season[0]).shape
+    fitted = np.empty((n,) + shape) if keep_fitted else None
+    sse = np.zeros(shape)
+    season = np.broadcast_to(season, (m,) + shape).copy()
+    for t in range(n):
+        s = season[t % m]
+        prev = level + trend
+        f = np.where(multiplicative, prev * s, prev + s)
+        if keep_fitted:
+            fitted[t] = f
+        else:
+            sse += (y[t] - f) ** 2
+        new_level = np.where(multiplicative,
+                             alpha * y[t] / s + (1 - alpha) * prev,
+                             alpha * (y[t] - s) + (1 - alpha) * prev)
+        trend = beta * (new_level - level) + (1 - beta) * trend
+        season[t % m] = np.where(multiplicative,
+                                 gamma * y[t] / prev + (1 - gamma) * s,
+                                 gamma * (y[t] - prev) + (1 - gamma) * s)
+        level = new_level
+    # Rotate so that row 0 is the season of the first forecast step.
+    season = np.roll(season, -(n % m), axis=0)
+    if keep_fitted:
+        sse = np.sum((y - fitted) ** 2, axis=0)
+    return fitted, sse, level, trend, season
+
+
+def _optimize(y, multiplicative, init, grid, rounds):
+    """Per-column (alpha, beta, gamma) minimizing the SSE."""
+    k = y.shape[1]
+    level, trend, season = init
+    points = np.linspace(0.0, 1.0, grid)
+    candidates = np.array(np.meshgrid(points, points, points, indexing='ij')).reshape(3, -1).T
+    c = len(candidates)
+
+    def sse_of(params):
+        # params: (c, k, 3) -> SSE (c, k). The candidates broadcast against
+        # the columns, which go through in chunks so that only the states of
+        # about SEARCH_CELLS (candidate, column) pairs are held at once.
+        sse = np.empty(params.shape[:2])
+        width = max(1, SEARCH_CELLS // params.shape[0])
+        for j in range(0, k, width):
+            cols = slice(j, j + width)
+            a, b, g = (params[:, cols, i] for i in range(3))
+            _, sse[:, cols], _, _, _ = _run(y[:, cols], a, b, g, level[cols], trend[cols],
+                                            season[:, None, cols], multiplicative[cols],
+                                            keep_fitted=False)
+        return np.nan_to_num(sse, nan=np.inf)
+
+    grid_sse = sse_of(np.broadcast_to(candidates[:, None, :], (c, k, 3)))
+    best = candidates[np.argmin(grid_sse, axis=0)]
+    best_sse = grid_sse.min(axis=0)
+
+    step = np.full(k, 1.0 / (grid - 1) / 2)
+    moves = np.vstack([np.eye(3), -np.eye(3)])
+    for _ in range(rounds):
+        trial = np.clip(best[None] + moves[:, None, :] * step[None, :, None], 0.0, 1.0)
+        trial_sse = sse_of(trial)
+        i = np.argmin(trial_sse, axis=0)
+        improved = trial_sse[i, np.arange(k)] < best_sse
+        best = np.where(improved[:, None], trial[i, np.arange(k)], best)
+        best_sse = np.where(improved, trial_sse[i, np.arange(k)], best_sse)
+        step = np.where(improved, step, step / 2)
+    return best[:, 0], best[:, 1], best[:, 2]
+
+
+def holt_winters(data, seasonal_periods=12, seasonal='add', alpha=None, beta=None,
+                 gamma=None, grid=5, rounds=30):
+    """Fit additive-trend Holt-Winters models to every column of `data`.
+
+    data      -- Series, DataFrame or (time x series) array without NaNs
+    seasonal  -- 'add', 'mul', or a per-column sequence of those, so additive
+                 and multiplicative models can share one pass
+    alpha, beta, gamma -- fixed smoothing parameters (scalars or per column);
+                 estimated when all three are None
+    """
+    values = as_matrix(data)
+    n, k = values.shape
+    m = seasonal_periods
+    if n < 2 * m:
+        raise ValueError("need at least two full seasonal cycles")
+    kinds = [seasonal] * k if isinstance(seasonal, str) else list(seasonal)
+    multiplicative = np.array([s.startswith('mul') for s in kinds])
+    if np.any(multiplicative & np.any(values <= 0, axis=0)):
+        raise ValueError("multiplicative seasonality requires strictly positive data")
+
+    init = initial_states(values, m, multiplicative)
+    if alpha is None and beta is None and gamma is None:
+        alpha, beta, gamma = _optimize(values, multiplicative, init, grid, rounds)
+    alpha, beta, gamma = (np.broadcast_to(np.asarray(p, dtype=float), (k,)).copy()
+                          for p in (alpha, beta, gamma))
+    fitted, sse, level, trend, season = _run(values, alpha, beta, gamma, *init, multiplicative)
+    return HoltWintersFit(alpha, beta, gamma, fitted, sse, level, trend, season,
+                          multiplicative, wrapper(data, k))
+
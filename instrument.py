@@ -0,0 +1,188 @@
+"""Lightweight stage tracing for the scripts.
+
+    with stage('fit') as st:
+        res = model.fit()
+        st.record_fit(res)
+
+Each finished stage appends one JSON line to the trace: stage name, parent
+stage, script, pid, start time, duration, status, peak RSS so far and any
+recorded fields (row counts, fit iterations, ...). A stage that raises is
+logged with the exception type and message, and the exception propagates
+unchanged, so the scripts' own `except Exception` handling still applies.
+
+Tracing is off unless $NLP_TRACE names a trace file ('-' for stderr) or
+enable() is called. While off, stage() hands out one shared no-op object and
+@traced functions are called directly.
+"""
+import functools
+import json
+import os
+import sys
+import threading
+import time
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+_sink = None
+_lock = threading.Lock()
+_local = threading.local()
+
+
+def enable(target):
+    """Start writing trace lines to `target`: a path (appended to), '-' for
+    stderr, or an open text file."""
+    global _sink
+    disable()
+    if target == '-':
+        _sink = sys.stderr
+    elif isinstance(target, str):
+        _sink = open(target, 'a', encoding='utf-8', buffering=1)
+    else:
+        _sink = target
+
+
+def disable():
+    global _sink
+    sink, _sink = _sink, None
+    if sink is not None and sink is not sys.stderr and hasattr(sink, 'close') and not sink.closed:
+        sink.close()
+
+
+def enabled():
+    return _sink is not None
+
+
+def _emit(record):
+    line = json.dumps(record, default=str)
+    with _lock:
+        if _sink is not None:
+            _sink.write(line + '\n')
+            _sink.flush()
+
+
+def _peak_rss_kb():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss if resource else None
+
+
+def _stack():
+    stack = getattr(_local, 'stack', None)
+    if stack is None:
+        stack = _local.stack = []
+    return stack
+
+
+class _NullStage:
+    """Stand-in returned while tracing is off; every method does nothing."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def set(self, **fields):
+        pass
+
+    def record_rows(self, data, name='rows'):
+        pass
+
+    def record_fit(self, results):
+        pass
+
+
+_NULL_STAGE = _NullStage()
+
+
+class Stage:
+    def __init__(self, name, fields):
+        self.name = name
+        self.fields = fields
+
+    def set(self, **fields):
+        self.fields.update(fields)
+
+    def record_rows(self, data, name='rows'):
+        """Record len(data) (rows of a DataFrame, items of a list, ...)."""
+        try:
+            self.fields[name] = len(data)
+        except TypeError:
+            pass
+
+    def record_fit(self, results):
+        """Record optimizer iterations, convergence and AIC of a statsmodels fit."""
+        retvals = getattr(results, 'mle_retvals', None) or {}
+        for key in ('iterations', 'converged', 'fcalls'):
+            if key in retvals:
+                self.fields[key] = retvals[key]
+        aic = getattr(results, 'aic', None)
+        if aic is not None:
+            self.fields['aic'] = float(aic)
+
+    def __enter__(self):
+        stack = _stack()
+        self._parent = stack[-1].name if stack else None
+        stack.append(self)
+        self._wall = time.time()
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        duration = time.perf_counter() - self._start
+        _stack().pop()
+        record = {
+            'stage': self.name,
+            'parent': self._parent,
+            'script': os.path.basename(sys.argv[0]) if sys.argv else None,
+            'pid': os.getpid(),
+            'start': self._wall,
+            'duration': duration,
+            'status': 'ok' if exc_type is None else 'error',
+            'peak_rss_kb': _peak_rss_kb(),
+        }
+        if exc_type is not None:
+            record['error'] = f'{exc_type.__name__}: {exc}'
+        record.update(self.fields)
+        _emit(record)
+        return False
+
+
+def stage(name, **fields):
+    """Context manager timing one stage (load, parse, preprocess, fit,
+    diagnose, report, ...); extra keyword arguments are logged with it."""
+    if _sink is None:
+        return _NULL_STAGE
+    return Stage(name, fields)
+
+
+def traced(name=None):
+    """Decorator running the whole function as one stage (default: its name)."""
+    def decorate(func):
+        label = name or func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if _sink is None:
+                return func(*args, **kwargs)
+            with Stage(label, {}):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def event(name, **fields):
+    """Log a single point-in-time record, e.g. an error a script swallows."""
+    if _sink is None:
+        return
+    stack = _stack()
+    record = {'event': name, 'parent': stack[-1].name if stack else None,
+              'script': os.path.basename(sys.argv[0]) if sys.argv else None,
+              'pid': os.getpid(), 'start': time.time()}
+    record.update(fields)
+    _emit(record)
+
+
+if os.environ.get('NLP_TRACE'):
+    enable(os.environ['NLP_TRACE'])
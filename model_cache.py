@@ -0,0 +1,201 @@
+"""Content-addressed on-disk cache of fitted ARIMA / SARIMAX models.
+
+A fitted model is identified by a hash of everything that determines it: the
+training series (values and index), the exog columns, the model class, the
+orders, any other model options, the fit options and the statsmodels
+version. Only compact
+arrays are stored (parameters, their covariance matrix and the final
+predicted state). A cache hit rebuilds a full results object by running the
+Kalman smoother at the stored parameters, with no optimization, so
+summary(), forecast() and get_forecast() work as after a normal fit.
+
+Artifacts are evicted by age (time since last use) and by total size, oldest
+first.
+"""
+import hashlib
+import json
+import os
+import time
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from instrument import stage
+
+DEFAULT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.model_cache')
+MAX_BYTES = 256 * 1024 ** 2
+MAX_AGE = 30 * 24 * 3600
+
+
+def cache_dir(directory=None):
+    return directory or os.environ.get('MODEL_CACHE_DIR') or DEFAULT_DIR
+
+
+def _model_class(model):
+    if model in (None, 'arima'):
+        from statsmodels.tsa.arima.model import ARIMA
+        return ARIMA
+    if model == 'sarimax':
+        from statsmodels.tsa.statespace.sarimax import SARIMAX
+        return SARIMAX
+    return model
+
+
+def _hash_data(h, data):
+    if data is None:
+        h.update(b'none')
+        return
+    frame = pd.DataFrame(data)
+    h.update(repr([str(c) for c in frame.columns]).encode())
+    h.update(np.ascontiguousarray(frame.to_numpy(dtype=float)).tobytes())
+    index = frame.index
+    if isinstance(index, pd.DatetimeIndex):
+        h.update(index.asi8.tobytes())
+        h.update(str(index.freqstr).encode())
+    else:
+        h.update(repr(list(index)).encode())
+
+
+def model_key(endog, model_class, order, seasonal_order=None, exog=None, fit_kwargs=None,
+              **model_kwargs):
+    """Hex digest identifying one model specification on one training set.
+
+    fit_kwargs are the options passed to fit() (method, cov_type, ...).
+    """
+    import statsmodels
+
+    h = hashlib.sha256()
+    _hash_data(h, endog)
+    _hash_data(h, exog)
+    spec = [statsmodels.__version__, model_class.__module__, model_class.__qualname__,
+            tuple(order), seasonal_order and tuple(seasonal_order),
+            sorted((k, repr(v)) for k, v in model_kwargs.items())]
+    if fit_kwargs:
+        spec.append(sorted((k, repr(v)) for k, v in fit_kwargs.items()))
+    h.update(repr(spec).encode())
+    return h.hexdigest()
+
+
+def _artifact_path(directory, key):
+    return os.path.join(directory, key + '.npz')
+
+
+def save_results(results, path):
+    """Write params, covariance and final state of `results` to `path` (.npz)."""
+    meta = {'cov_type': results.cov_type, 'cov_kwds': results.cov_kwds or {}}
+    tmp = path + '.tmp'
+    with open(tmp, 'wb') as f:
+        np.savez(f,
+                 params=np.asarray(results.params, dtype=float),
+                 cov=np.asarray(results.cov_params_default, dtype=float),
+                 state=np.asarray(results.predicted_state[:, -1]),
+                 state_cov=np.asarray(results.predicted_state_cov[:, :, -1]),
+                 meta=np.array(json.dumps(meta, default=str)))
+    os.replace(tmp, path)
+
+
+def rebuild_results(model, path):
+    """Results of `model` at the parameters stored in `path`, or None.
+
+    None is also returned when the rebuilt final state does not match the
+    stored one, e.g. after a statsmodels change in the filter.
+    """
+    try:
+        with np.load(path, allow_pickle=False) as f:
+            arrays = {name: f[name] for name in f.files}
+    except (OSError, ValueError, KeyError):
+        return None
+    meta = json.loads(str(arrays['meta']))
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        rebuilt = model.smooth(arrays['params'], cov_type='none')
+    if not np.allclose(rebuilt.predicted_state[:, -1], arrays['state'], equal_nan=True):
+        return None
+    res = rebuilt._results
+    res.cov_type = meta['cov_type']
+    res.cov_kwds = meta['cov_kwds']
+    res.cov_params_default = arrays['cov']
+    res._cache = {}
+    return rebuilt
+
+
+def cached_fit(endog, order=(0, 0, 0), seasonal_order=None, exog=None, model=None,
+               directory=None, max_bytes=MAX_BYTES, max_age=MAX_AGE, fit_kwargs=None,
+               **model_kwargs):
+    """Fit `model` (ARIMA by default, 'sarimax' or a class) or reuse a cached fit.
+
+    Has the fit(series, order) signature expected by order_search, so it can
+    be passed to search_orders(..., fit=cached_fit). Extra keyword arguments
+    go to the model constructor; they and fit_kwargs are part of the key.
+    """
+    model_class = _model_class(model)
+    if seasonal_order is not None:
+        model_kwargs['seasonal_order'] = seasonal_order
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        mod = model_class(endog, exog=exog, order=order, **model_kwargs)
+    fit_kwargs = dict(fit_kwargs or {})
+    directory = cache_dir(directory)
+    key = model_key(endog, model_class, order, exog=exog, fit_kwargs=fit_kwargs, **model_kwargs)
+    path = _artifact_path(directory, key)
+
+    with stage('fit', model=model_class.__name__, order=order) as st:
+        if os.path.exists(path):
+            res = rebuild_results(mod, path)
+            if res is not None:
+                st.set(cache='hit')
+                os.utime(path)
+                return res
+
+        st.set(cache='miss')
+        if model_class.__name__ == 'SARIMAX':
+            fit_kwargs.setdefault('disp', False)
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            res = mod.fit(**fit_kwargs)
+        st.record_fit(res)
+    try:
+        os.makedirs(directory, exist_ok=True)
+        save_results(res, path)
+        prune(directory, max_bytes, max_age)
+    except OSError:
+        # No writable cache directory: the fit is still returned.
+        pass
+    return res
+
+
+def prune(directory=None, max_bytes=MAX_BYTES, max_age=MAX_AGE):
+    """Evict artifacts unused for `max_age` seconds, then the least recently
+    used ones until the cache holds at most `max_bytes`. Returns the number
+    of files removed."""
+    directory = cache_dir(directory)
+    try:
+        names = [n for n in os.listdir(directory) if n.endswith('.npz')]
+    except OSError:
+        return 0
+    entries = []
+    for name in names:
+        path = os.path.join(directory, name)
+        try:
+            st = os.stat(path)
+        except OSError:
+            continue
+        entries.append((st.st_mtime, st.st_size, path))
+    entries.sort()
+
+    now = time.time()
+    total = sum(size for _, size, _ in entries)
+    removed = 0
+    for mtime, size, path in entries:
+        expired = max_age is not None and now - mtime > max_age
+        oversize = max_bytes is not None and total > max_bytes
+        if not (expired or oversize):
+            continue
+        try:
+            os.remove(path)
+        except OSError:
+            continue
+        total -= size
+        removed += 1
+    return removed
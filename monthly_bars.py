@@ -0,0 +1,257 @@
+"""Daily prices to the monthly table of the S2-S4 Practice files, incrementally.
+
+The monthly Practice files are the daily S1 Practice file resampled to month
+ends, with columns derived from the monthly Close:
+
+    Open, High, Low, Close, Volume   monthly means of the daily values
+    Close_diff                       Close - previous Close
+    SMA_10, SMA_30                   rolling means of Close
+    SES                              one-step SES fit, alpha 0.2, level
+                                     started at the first Close
+
+update_monthly() builds that table from a daily CSV in one streaming pass,
+reading fixed-size blocks, so memory does not grow with the history. Per-
+month running sums are kept in a state file next to the output. When days
+are appended to the daily CSV, a later call reads only the new bytes,
+folds them into their months, and rewrites the output from the first
+affected month on. Earlier rows are left in place. If the daily file was
+not just appended to, or the options changed, the table is rebuilt. A file
+counts as appended to when it did not shrink and its first and last 4 KB
+before the resume point are unchanged. Edits elsewhere in the middle are
+not detected; delete the state file to force a rebuild.
+
+how='ohlc' gives conventional bars instead of means: first Open, highest
+High, lowest Low, last Close and total Volume.
+"""
+import hashlib
+import io
+import json
+import math
+import os
+
+import numpy as np
+import pandas as pd
+
+from instrument import stage
+
+PRICE_COLUMNS = ('Open', 'High', 'Low', 'Close', 'Volume')
+OUTPUT_DATE_FORMAT = '%Y-%m-%d %H:%M:%S'
+BLOCK_SIZE = 4 << 20
+STATE_VERSION = 1
+
+
+class MonthlyAggregator:
+    """Running per-month accumulators and the derived monthly table.
+
+    months maps a month-end date string to [days, sum O, H, L, C, V,
+    first date, first Open, max High, min Low, last date, last Close].
+    """
+
+    def __init__(self, alpha=0.2, windows=(10, 30), how='mean', months=None):
+        if how not in ('mean', 'ohlc'):
+            raise ValueError("how must be 'mean' or 'ohlc'")
+        self.alpha = alpha
+        self.windows = tuple(windows)
+        self.how = how
+        self.months = dict(months or {})
+
+    def add(self, daily):
+        """Fold daily rows (Date + OHLCV columns) in; returns the earliest
+        month-end touched, or None for an empty frame."""
+        if daily.empty:
+            return None
+        daily = daily.sort_values('Date', kind='stable')
+        month = (daily['Date'] + pd.offsets.MonthEnd(0)).dt.normalize()
+        groups = daily.groupby(month.dt.strftime('%Y-%m-%d'), sort=True)
+        sums = groups[list(PRICE_COLUMNS)].sum()
+        first = groups.first()
+        last = groups.last()
+        size = groups.size()
+        high = groups['High'].max()
+        low = groups['Low'].min()
+        for key in size.index:
+            row = [int(size[key])] + [float(v) for v in sums.loc[key]] + [
+                first.at[key, 'Date'].isoformat(), float(first.at[key, 'Open']),
+                float(high[key]), float(low[key]),
+                last.at[key, 'Date'].isoformat(), float(last.at[key, 'Close'])]
+            old = self.months.get(key)
+            if old is not None:
+                row = _merge(old, row)
+            self.months[key] = row
+        return size.index[0]
+
+    def frame(self):
+        """The monthly table, indexed by month end."""
+        keys = sorted(self.months)
+        acc = np.array([[v for i, v in enumerate(self.months[k]) if i not in (6, 10)]
+                        for k in keys], dtype=float).reshape(len(keys), 10)
+        if self.how == 'mean':
+            bars = acc[:, 1:6] / acc[:, :1]
+        else:
+            bars = np.column_stack([acc[:, 6], acc[:, 7], acc[:, 8], acc[:, 9], acc[:, 5]])
+        df = pd.DataFrame(bars, columns=list(PRICE_COLUMNS),
+                          index=pd.DatetimeIndex(keys, name='Date'))
+        close = df['Close']
+        df['Close_diff'] = close.diff()
+        for window in self.windows:
+            df[f'SMA_{window}'] = close.rolling(window).mean()
+        df['SES'] = ses_fitted(close.to_numpy(), self.alpha)
+        return df
+
+
+def _merge(old, new):
+    merged = [old[0] + new[0]] + [a + b for a, b in zip(old[1:6], new[1:6])]
+    merged += old[6:8] if old[6] <= new[6] else new[6:8]
+    merged += [max(old[8], new[8]), min(old[9], new[9])]
+    merged += old[10:12] if old[10] > new[10] else new[10:12]
+    return merged
+
+
+def ses_fitted(y, alpha=0.2):
+    """One-step-ahead SES fitted values with the level started at y[0]."""
+    fitted = np.empty(len(y))
+    level = y[0] if len(y) else np.nan
+    for t in range(len(y)):
+        fitted[t] = level
+        level = alpha * y[t] + (1 - alpha) * level
+    return fitted
+
+
+def state_path(out_csv):
+    return out_csv + '.state.json'
+
+
+def _fingerprint(f, offset):
+    """Hash of the first and last 4 KB of f before `offset`."""
+    digest = hashlib.sha256()
+    f.seek(0)
+    digest.update(f.read(min(offset, 4096)))
+    start = max(0, offset - 4096)
+    f.seek(start)
+    digest.update(f.read(offset - start))
+    return digest.hexdigest()
+
+
+def _format(value):
+    if isinstance(value, pd.Timestamp):
+        return value.strftime(OUTPUT_DATE_FORMAT)
+    value = float(value)
+    return '' if math.isnan(value) else repr(value)
+
+
+def _read_blocks(f, header, date_format, block_size):
+    """Yield (parsed daily rows, end offset, date format) for the lines from
+    f's position to the end of the file."""
+    from csv_loader import detect_date_format
+
+    pending = b''
+    while True:
+        chunk = f.read(block_size)
+        data = pending + chunk
+        if chunk:
+            cut = data.rfind(b'\n') + 1
+        elif data:
+            # At end of file the bytes after the last newline are the last row.
+            cut = len(data)
+        else:
+            break
+        pending = data[cut:]
+        if not cut:
+            continue
+        df = pd.read_csv(io.BytesIO(header + data[:cut]))
+        if df.empty:
+            continue
+        if date_format is None:
+            date_format = detect_date_format(df['Date'])
+        df['Date'] = pd.to_datetime(df['Date'], format=date_format)
+        yield df, f.tell() - len(pending), date_format
+
+
+def update_monthly(daily_csv, out_csv, alpha=0.2, windows=(10, 30), how='mean',
+                   block_size=BLOCK_SIZE):
+    """Create or bring up to date `out_csv` from `daily_csv`.
+
+    Returns the number of daily rows read in this call (0 when nothing was
+    appended).
+    """
+    options = {'alpha': alpha, 'windows': list(windows), 'how': how}
+    state = _load_state(daily_csv, out_csv, options)
+    if state is None:
+        state = {'version': STATE_VERSION, 'options': options, 'offset': None,
+                 'date_format': None, 'months': {}, 'rows': []}
+    agg = MonthlyAggregator(alpha, windows, how, state['months'])
+
+    with open(daily_csv, 'rb') as f, stage('aggregate', source=os.path.basename(daily_csv)) as st:
+        header = f.readline()
+        if state['offset'] is None:
+            state['offset'] = f.tell()
+        f.seek(state['offset'])
+        first_key, nrows = None, 0
+        for df, end, date_format in _read_blocks(f, header, state['date_format'], block_size):
+            state['date_format'] = date_format
+            key = agg.add(df)
+            first_key = key if first_key is None else min(first_key, key)
+            nrows += len(df)
+            state['offset'] = end
+        state['fingerprint'] = _fingerprint(f, state['offset'])
+        st.set(rows=nrows)
+
+    if nrows or not os.path.exists(out_csv):
+        _write_from(agg, out_csv, state, first_key)
+    state['source'] = os.path.abspath(daily_csv)
+    state['months'] = agg.months
+    state['out_size'] = os.path.getsize(out_csv)
+    tmp = state_path(out_csv) + '.tmp'
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(state, f)
+    os.replace(tmp, state_path(out_csv))
+    return nrows
+
+
+def _load_state(daily_csv, out_csv, options):
+    """The saved state if the output can be extended from it, else None."""
+    try:
+        with open(state_path(out_csv), encoding='utf-8') as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if state.get('version') != STATE_VERSION or state.get('options') != options:
+        return None
+    if state.get('source') != os.path.abspath(daily_csv):
+        return None
+    try:
+        if os.path.getsize(out_csv) != state['out_size']:
+            return None
+        if os.path.getsize(daily_csv) < state['offset']:
+            return None
+        with open(daily_csv, 'rb') as f:
+            # Bytes already consumed must be unchanged: only appends are incremental.
+            if _fingerprint(f, state['offset']) != state['fingerprint']:
+                return None
+    except OSError:
+        return None
+    return state
+
+
+def _write_from(agg, out_csv, state, first_key):
+    """Rewrite the output from the row of month `first_key` to the end."""
+    table = agg.frame()
+    keys = [ts.strftime('%Y-%m-%d') for ts in table.index]
+    rows = state['rows']
+    start = 0
+    if first_key is not None and os.path.exists(out_csv) and rows:
+        start = min(keys.index(first_key), len(rows) - 1)
+    mode = 'r+b' if start else 'wb'
+    with open(out_csv, mode) as f:
+        if start:
+            f.seek(rows[start])
+            f.truncate()
+        else:
+            f.write((','.join(['Date'] + list(table.columns)) + '\n').encode())
+            rows = [f.tell()]
+        del rows[start + 1:]
+        for date, values in zip(table.index[start:], table.iloc[start:].itertuples(index=False)):
+            f.write((','.join([_format(date)] + [_format(v) for v in values]) + '\n').encode())
+            rows.append(f.tell())
+    # rows[i] is where month i's line starts; the last entry is the end of file.
+    state['rows'] = rows
@@ -0,0 +1,113 @@
+"""Memoized lemmatization and stemming.
+
+Word types repeat heavily in real text, so Normalizer keeps a bounded LRU
+cache from (lowercase form, POS) to (lemma, stem) and only runs spaCy or the
+Snowball stemmer on a miss. The cache can be saved to a JSON file and loaded
+again on the next run.
+
+The key is lowercased, so two spellings differing only in case share a lemma
+when their POS is the same (e.g. "Running"/"running" as VERB -> "run").
+"""
+import json
+import os
+from collections import OrderedDict
+
+
+class Normalizer:
+    """LRU cache of (lemma, stem) per word type.
+
+    nlp       -- spaCy pipeline, needed only to lemmatize bare words
+    stemmer   -- object with .stem(); defaults to the English SnowballStemmer
+    maxsize   -- entries kept before the least recently used is evicted
+    path      -- JSON file loaded now if it exists and written by save()
+    """
+
+    def __init__(self, nlp=None, stemmer=None, maxsize=100_000, path=None):
+        if stemmer is None:
+            from nltk.stem import SnowballStemmer
+            stemmer = SnowballStemmer(language='english')
+        self.nlp = nlp
+        self.stemmer = stemmer
+        self.maxsize = maxsize
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._cache = OrderedDict()
+        if path is not None and os.path.exists(path):
+            self.load(path)
+
+    def __len__(self):
+        return len(self._cache)
+
+    def _get(self, key):
+        entry = self._cache.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._cache.move_to_end(key)
+        return entry
+
+    def _put(self, key, entry):
+        self._cache[key] = entry
+        self._cache.move_to_end(key)
+        if len(self._cache) > self.maxsize:
+            self._cache.popitem(last=False)
+            self.evictions += 1
+
+    def normalize_token(self, token):
+        """(lemma, stem) of a spaCy token, keyed on its lowercase form and POS."""
+        key = (token.lower_, token.pos_)
+        entry = self._get(key)
+        if entry is None:
+            entry = (token.lemma_, self.stemmer.stem(token.lower_))
+            self._put(key, entry)
+        return entry
+
+    def normalize(self, word, pos=None):
+        """(lemma, stem) of a bare word; the lemma comes from nlp(word)[0] on a miss."""
+        lower = word.lower()
+        key = (lower, pos)
+        entry = self._get(key)
+        if entry is None:
+            if self.nlp is None:
+                raise ValueError("Normalizer needs an nlp pipeline to lemmatize bare words")
+            entry = (self.nlp(word)[0].lemma_, self.stemmer.stem(lower))
+            self._put(key, entry)
+        return entry
+
+    def lemma(self, word, pos=None):
+        return self.normalize(word, pos)[0]
+
+    def stem(self, word, pos=None):
+        return self.normalize(word, pos)[1]
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            'size': len(self._cache),
+            'maxsize': self.maxsize,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+        }
+
+    def save(self, path=None):
+        """Write the cache, least recently used first, to `path` as JSON."""
+        path = path or self.path
+        if path is None:
+            raise ValueError("no path given to save the cache to")
+        entries = [[word, pos, lemma, stem] for (word, pos), (lemma, stem) in self._cache.items()]
+        tmp = path + '.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump({'version': 1, 'entries': entries}, f, ensure_ascii=False)
+        os.replace(tmp, path)
+
+    def load(self, path):
+        """Merge entries saved by save(); counts as neither hits nor misses."""
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        for word, pos, lemma, stem in data.get('entries', []):
+            self._put((word, pos), (lemma, stem))
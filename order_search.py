@@ -0,0 +1,180 @@
+"""AR/MA order search shared by the Day2/Day3 ARIMA scripts.
+
+Candidate orders are fitted concurrently in a process pool and the fitted
+results objects are kept, so the selected model is never refit. Residual
+diagnostics for every candidate are computed in one batch on request.
+"""
+import os
+import time
+import warnings
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+
+from instrument import stage
+
+
+def ar_ma_orders(max_p=5, max_q=5):
+    """AR(1)..AR(max_p) followed by MA(1)..MA(max_q), the grid used by the scripts."""
+    orders = [(p, 0, 0) for p in range(1, max_p + 1)]
+    orders += [(0, 0, q) for q in range(1, max_q + 1)]
+    return orders
+
+
+def order_label(order):
+    """Short name of an order: AR(p), MA(q) or ARIMA(p,d,q)."""
+    p, d, q = order
+    if d == 0 and q == 0:
+        return f"AR({p})"
+    if d == 0 and p == 0:
+        return f"MA({q})"
+    return f"ARIMA({p},{d},{q})"
+
+
+def fit_order(series, order):
+    """Fit a single ARIMA order. Module level so it can run in a worker process."""
+    # statsmodels installs "always" filters for its warnings on first import,
+    # so import it before silencing warnings.
+    from statsmodels.tsa.arima.model import ARIMA
+    warnings.filterwarnings("ignore")
+    with stage('fit_order', order=order) as st:
+        res = ARIMA(series, order=order).fit()
+        st.record_fit(res)
+    return res
+
+
+class SearchResult:
+    """Outcome of an order search.
+
+    fits     -- {order: fitted results} in candidate order, failed fits left out
+    errors   -- {order: exception} for candidates whose fit raised
+    skipped  -- orders never fitted because of the time budget or early stop
+    diagnostics -- residual_diagnostics.Diagnostics of the fits, one column
+                   per order, once diagnose() has run
+    """
+
+    def __init__(self, orders, criterion):
+        self.orders = list(orders)
+        self.criterion = criterion
+        self.fits = {}
+        self.errors = {}
+        self.skipped = []
+        self.diagnostics = None
+
+    def score(self, order):
+        return getattr(self.fits[order], self.criterion)
+
+    @property
+    def scores(self):
+        return {order: self.score(order) for order in self.fits}
+
+    @property
+    def best_order(self):
+        # Strict comparison in candidate order, so ties go to the earlier order
+        # exactly like the original serial loops.
+        best = None
+        for order in self.fits:
+            if best is None or self.score(order) < self.score(best):
+                best = order
+        return best
+
+    @property
+    def best(self):
+        order = self.best_order
+        return None if order is None else self.fits[order]
+
+    def diagnose(self, lags=(1,), standardized=False, model_df=0):
+        """Ljung-Box/Box-Pierce at `lags`, Jarque-Bera and breakvar tests on
+        the residuals of every fitted order, in one vectorized pass."""
+        from residual_diagnostics import diagnose, fit_residuals
+
+        orders = list(self.fits)
+        if not orders:
+            return None
+        self.diagnostics = diagnose([fit_residuals(self.fits[o], standardized) for o in orders],
+                                    lags=lags, model_df=model_df, names=orders)
+        return self.diagnostics
+
+    def _sort(self):
+        self.fits = {o: self.fits[o] for o in self.orders if o in self.fits}
+
+
+def search_orders(series, orders=None, criterion="aic", max_workers=None,
+                  time_budget=None, early_stop=None, fit=fit_order, diagnose_lags=None):
+    """Fit every candidate order of `series` and keep the fitted results.
+
+    fit          -- callable(series, order) -> results with a `criterion`
+                    attribute; must be picklable to run in the pool
+    max_workers  -- process pool size; defaults to one worker per core, and
+                    1 fits serially in this process without a pool
+    time_budget  -- seconds; orders not finished in time are skipped
+    early_stop   -- callable(search_result) -> bool, checked after every fit;
+                    when it returns True the remaining orders are skipped
+    diagnose_lags -- if given, run result.diagnose(diagnose_lags) on all fits
+    """
+    if orders is None:
+        orders = ar_ma_orders()
+    result = SearchResult(orders, criterion)
+    if not result.orders:
+        return result
+
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    max_workers = max(1, min(max_workers, len(result.orders)))
+    deadline = None if time_budget is None else time.monotonic() + time_budget
+
+    with stage('fit', candidates=len(result.orders), workers=max_workers) as st:
+        if max_workers == 1:
+            _search_serial(series, result, deadline, early_stop, fit)
+        else:
+            _search_pool(series, result, max_workers, deadline, early_stop, fit)
+        result._sort()
+        st.set(fitted=len(result.fits), failed=len(result.errors), skipped=len(result.skipped))
+    if diagnose_lags is not None:
+        result.diagnose(diagnose_lags)
+    return result
+
+
+def _record(result, order, fit=None, error=None):
+    if error is not None:
+        result.errors[order] = error
+    else:
+        result.fits[order] = fit
+
+
+def _search_serial(series, result, deadline, early_stop, fit):
+    for i, order in enumerate(result.orders):
+        if deadline is not None and time.monotonic() >= deadline:
+            result.skipped.extend(result.orders[i:])
+            return
+        try:
+            _record(result, order, fit=fit(series, order))
+        except Exception as exc:
+            _record(result, order, error=exc)
+        if early_stop is not None and early_stop(result):
+            result.skipped.extend(result.orders[i + 1:])
+            return
+
+
+def _search_pool(series, result, max_workers, deadline, early_stop, fit):
+    executor = ProcessPoolExecutor(max_workers=max_workers)
+    pending = {executor.submit(fit, series, order): order for order in result.orders}
+    stopped = False
+    try:
+        while pending and not stopped:
+            timeout = None
+            if deadline is not None:
+                timeout = max(0.0, deadline - time.monotonic())
+            done, _ = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+            if not done:
+                break
+            for future in done:
+                order = pending.pop(future)
+                try:
+                    _record(result, order, fit=future.result())
+                except Exception as exc:
+                    _record(result, order, error=exc)
+            if early_stop is not None and early_stop(result):
+                stopped = True
+    finally:
+        result.skipped.extend(order for order in result.orders if order in pending.values())
+        # Fits already running cannot be interrupted; their results are discarded.
+        executor.shutdown(wait=not pending, cancel_futures=True)
@@ -0,0 +1,44 @@
+"""Shared input and output handling of the panel (time x series) modules.
+
+Series, DataFrames and arrays are all turned into one float matrix with
+time along axis 0 and one column per series; results computed on that
+matrix are given back the shape and labels of the input:
+
+    values = as_matrix(data)
+    wrap = wrapper(data, values.shape[1])
+    wrap(fitted)                   # labelled like data
+    wrap(forecasts, forecast=True) # indexed by the periods after data
+"""
+import numpy as np
+import pandas as pd
+
+
+def as_matrix(data):
+    """`data` as a float (time x series) array; a 1-D input is one column."""
+    if isinstance(data, pd.Series):
+        return data.to_numpy(dtype=float)[:, None]
+    values = np.asarray(data, dtype=float)
+    return values[:, None] if values.ndim == 1 else values
+
+
+def wrapper(data, k):
+    """Function giving (time x k) results the shape and labels of `data`."""
+    def wrap(array, forecast=False):
+        if isinstance(data, (pd.Series, pd.DataFrame)):
+            index = data.index
+            if forecast:
+                index = future_index(index, len(array))
+            if isinstance(data, pd.Series):
+                return pd.Series(array[:, 0], index=index, name=data.name)
+            return pd.DataFrame(array, index=index, columns=data.columns)
+        return array if k > 1 or np.ndim(data) > 1 else array[:, 0]
+    return wrap
+
+
+def future_index(index, steps):
+    """Index of the `steps` periods following `index`."""
+    if isinstance(index, pd.DatetimeIndex) and index.freq is not None:
+        return pd.date_range(index[-1] + index.freq, periods=steps, freq=index.freq)
+    if isinstance(index, pd.RangeIndex):
+        return pd.RangeIndex(index.stop, index.stop + steps * index.step, index.step)
+    return pd.RangeIndex(len(index), len(index) + steps)
@@ -0,0 +1,62 @@
+"""Sentences whose nominal subject is a PERSON entity.
+
+Every token already carries its entity label (`token.ent_type_`), so the
+PERSON check is a per-token lookup instead of a scan over `doc.ents` for
+every subject. Files are streamed through nlp.pipe (see text_stream), which
+keeps memory flat on news-archive-sized inputs.
+
+    python person_subjects.py archive/*.txt -o subjects.jsonl
+"""
+import argparse
+import json
+import os
+import sys
+
+from text_stream import pipe_file
+
+
+def person_subjects(doc):
+    """Yield (sentence, subject, verb) for every sentence of `doc` whose first
+    PERSON nsubj is found; the verb is the subject's syntactic head."""
+    for sent in doc.sents:
+        for token in sent:
+            if token.dep_ == "nsubj" and token.ent_type_ == "PERSON":
+                yield sent, token, token.head
+                break
+
+
+def iter_records(nlp, paths, batch_size=64, n_process=None):
+    """Yield one dict per matching sentence across all `paths`, in order."""
+    for path in paths:
+        for doc in pipe_file(nlp, path, batch_size=batch_size, n_process=n_process):
+            for sent, subject, verb in person_subjects(doc):
+                yield {
+                    "source": os.path.basename(path),
+                    "sentence": sent.text.strip(),
+                    "subject": subject.text,
+                    "verb": verb.text,
+                }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Extract PERSON subjects and their verbs as JSONL.")
+    parser.add_argument("paths", nargs="+", help="text files")
+    parser.add_argument("-o", "--output", default="-", help="JSONL file (default: stdout)")
+    parser.add_argument("--batch-size", type=int, default=64)
+    parser.add_argument("--n-process", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    from spacy_loader import load_model
+    nlp = load_model("subject")
+
+    out = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+    try:
+        for record in iter_records(nlp, args.paths, args.batch_size, args.n_process):
+            out.write(json.dumps(record, ensure_ascii=False) + "\n")
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,255 @@
+"""Residual diagnostics for many series at once.
+
+The residuals of every candidate model are stacked into one matrix (one
+column per model) and all tests run column-wise in NumPy:
+
+    autocorrelations   one FFT over the matrix, every lag up to the largest
+                       requested
+    Ljung-Box / Box-Pierce
+                       Q statistics and chi-squared p-values for all lags
+    Jarque-Bera        skewness, kurtosis, statistic and p-value
+    heteroskedasticity the breakvar test of the statsmodels summary: sum of
+                       squares of the last third over the first third,
+                       two-sided F p-value
+
+Series of different lengths are right-aligned with NaN in front; each
+column uses its own number of observations, so the results agree with
+acorr_ljungbox, jarque_bera and breakvar_heteroskedasticity_test run on
+that column alone (up to floating-point rounding of the FFT).
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from instrument import stage
+
+
+def residual_matrix(columns):
+    """Stack 1-D residual arrays into an (nobs, k) float matrix.
+
+    Shorter columns are right-aligned and padded with NaN at the top.
+    """
+    columns = [np.asarray(c, dtype=float).ravel() for c in columns]
+    nobs = max((len(c) for c in columns), default=0)
+    out = np.full((nobs, len(columns)), np.nan)
+    for j, c in enumerate(columns):
+        if len(c):
+            out[nobs - len(c):, j] = c
+    return out
+
+
+def _fft_length(n):
+    # Smallest 2^a * 3^b * 5^c >= n, which pocketfft transforms quickly.
+    best = 1 << max(0, (n - 1).bit_length())
+    p5 = 1
+    while p5 < best:
+        p35 = p5
+        while p35 < best:
+            m = p35
+            while m < n:
+                m *= 2
+            best = min(best, m)
+            p35 *= 3
+        p5 *= 5
+    return best
+
+
+def acf_matrix(x, nlags):
+    """Autocorrelations 0..nlags of every column of `x` via one FFT.
+
+    Missing values count as zero deviations and each column is normalised
+    by its own number of observations (the biased estimator used by
+    acorr_ljungbox). Returns an (nlags + 1, k) array.
+    """
+    x = np.asarray(x, dtype=float)
+    if x.ndim == 1:
+        x = x[:, None]
+    mask = ~np.isnan(x)
+    counts = mask.sum(axis=0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        means = np.where(mask, x, 0.0).sum(axis=0) / counts
+    xo = np.where(mask, x - means, 0.0)
+    n = _fft_length(2 * len(x) + 1)
+    spectrum = np.fft.rfft(xo, n=n, axis=0)
+    acov = np.fft.irfft(spectrum * spectrum.conj(), n=n, axis=0)[:nlags + 1]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return acov / acov[0]
+
+
+def q_statistics(acf, nobs, lags, model_df=0):
+    """Ljung-Box and Box-Pierce statistics from an acf_matrix() result.
+
+    nobs  -- observations per column
+    lags  -- 1-based lags to report
+    Returns (lb, lb_pvalue, bp, bp_pvalue), each (len(lags), k); p-values
+    are NaN where lag - model_df < 1.
+    """
+    from scipy import stats
+
+    lags = np.asarray(lags, dtype=int)
+    nobs = np.asarray(nobs, dtype=float)
+    maxlag = lags.max()
+    r2 = acf[1:maxlag + 1] ** 2
+    k = np.arange(1, maxlag + 1)[:, None]
+    lb = (nobs * (nobs + 2) * np.cumsum(r2 / (nobs - k), axis=0))[lags - 1]
+    bp = (nobs * np.cumsum(r2, axis=0))[lags - 1]
+    df = (lags - model_df)[:, None]
+    valid = np.broadcast_to(df > 0, lb.shape)
+    dof = np.where(df > 0, df, 1)
+    lb_p = np.where(valid, stats.chi2.sf(lb, dof), np.nan)
+    bp_p = np.where(valid, stats.chi2.sf(bp, dof), np.nan)
+    return lb, lb_p, bp, bp_p
+
+
+def jarque_bera(x):
+    """Column-wise Jarque-Bera: (jb, p-value, skewness, kurtosis)."""
+    from scipy import stats
+
+    x = np.asarray(x, dtype=float)
+    mask = ~np.isnan(x)
+    n = mask.sum(axis=0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        dev = np.where(mask, x - np.nansum(x, axis=0) / n, 0.0)
+        dev2 = dev * dev
+        m2 = dev2.sum(axis=0) / n
+        skew = (dev2 * dev).sum(axis=0) / n / m2 ** 1.5
+        kurtosis = (dev2 * dev2).sum(axis=0) / n / m2 ** 2
+    jb = n / 6.0 * (skew ** 2 + (kurtosis - 3) ** 2 / 4.0)
+    return jb, stats.chi2.sf(jb, 2), skew, kurtosis
+
+
+def breakvar(x):
+    """Column-wise breakvar heteroskedasticity test: (H, two-sided p-value).
+
+    H is the sum of squares of the last third of each column's observations
+    over that of the first third, as in the statsmodels summary footer.
+    """
+    from scipy import stats
+
+    x = np.asarray(x, dtype=float)
+    mask = ~np.isnan(x)
+    n = mask.sum(axis=0)
+    first = len(x) - n
+    h = np.round(n / 3.0).astype(int)
+    csum = np.vstack([np.zeros(x.shape[1]), np.cumsum(np.where(mask, x, 0.0) ** 2, axis=0)])
+    cols = np.arange(x.shape[1])
+    denom = csum[first + h, cols] - csum[first, cols]
+    numer = csum[-1] - csum[len(x) - h, cols]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        stat = np.where(h >= 2, numer / denom, np.nan)
+    dof = np.maximum(h, 1)
+    p = 2 * np.minimum(stats.f.cdf(stat, dof, dof), stats.f.sf(stat, dof, dof))
+    return stat, p
+
+
+class Diagnostics:
+    """Test results for k residual series (columns) and the requested lags.
+
+    names          -- one label per column
+    lags           -- the Ljung-Box / Box-Pierce lags
+    acf            -- (max lag + 1, k) autocorrelations
+    lb_stat, lb_pvalue, bp_stat, bp_pvalue
+                   -- (len(lags), k)
+    jb, jb_pvalue, skew, kurtosis, het, het_pvalue, nobs
+                   -- (k,)
+    """
+
+    def __init__(self, names, lags, parts):
+        self.names = list(names)
+        self.lags = list(lags)
+        for key in ('acf', 'lb_stat', 'lb_pvalue', 'bp_stat', 'bp_pvalue'):
+            setattr(self, key, np.hstack([p[key] for p in parts]))
+        for key in ('nobs', 'jb', 'jb_pvalue', 'skew', 'kurtosis', 'het', 'het_pvalue'):
+            setattr(self, key, np.concatenate([p[key] for p in parts]))
+
+    def _column(self, name):
+        return self.names.index(name)
+
+    def ljung_box(self, name, boxpierce=False):
+        """The acorr_ljungbox(return_df=True) table of one column."""
+        j = self._column(name)
+        data = {'lb_stat': self.lb_stat[:, j], 'lb_pvalue': self.lb_pvalue[:, j]}
+        if boxpierce:
+            data.update(bp_stat=self.bp_stat[:, j], bp_pvalue=self.bp_pvalue[:, j])
+        return pd.DataFrame(data, index=np.asarray(self.lags))
+
+    def frame(self):
+        """One row per column: nobs, JB, skew, kurtosis, H and the Q tests per lag."""
+        data = {'nobs': self.nobs, 'jb': self.jb, 'jb_pvalue': self.jb_pvalue,
+                'skew': self.skew, 'kurtosis': self.kurtosis,
+                'het': self.het, 'het_pvalue': self.het_pvalue}
+        for i, lag in enumerate(self.lags):
+            data[f'lb_stat_{lag}'] = self.lb_stat[i]
+            data[f'lb_pvalue_{lag}'] = self.lb_pvalue[i]
+            data[f'bp_stat_{lag}'] = self.bp_stat[i]
+            data[f'bp_pvalue_{lag}'] = self.bp_pvalue[i]
+        return pd.DataFrame(data, index=pd.Index(self.names, name='series', tupleize_cols=False))
+
+
+def _diagnose_block(x, lags, model_df):
+    nobs = (~np.isnan(x)).sum(axis=0)
+    acf = acf_matrix(x, max(lags))
+    lb, lb_p, bp, bp_p = q_statistics(acf, nobs, lags, model_df)
+    jb, jb_p, skew, kurtosis = jarque_bera(x)
+    het, het_p = breakvar(x)
+    return {'acf': acf, 'lb_stat': lb, 'lb_pvalue': lb_p, 'bp_stat': bp, 'bp_pvalue': bp_p,
+            'nobs': nobs, 'jb': jb, 'jb_pvalue': jb_p, 'skew': skew, 'kurtosis': kurtosis,
+            'het': het, 'het_pvalue': het_p}
+
+
+def diagnose(residuals, lags=(1,), model_df=0, names=None, max_workers=1, block=256):
+    """Run every test on each residual series.
+
+    residuals    -- DataFrame (one column per series), 2-D array, or a
+                    dict/list of 1-D series of possibly different lengths
+    lags         -- int (1..lags) or iterable of Ljung-Box lags
+    model_df     -- degrees of freedom taken off the chi-squared tests
+    max_workers  -- column blocks of `block` series are split over a process
+                    pool; None uses one worker per core, 1 (the default)
+                    stays in this process
+    """
+    if isinstance(residuals, pd.DataFrame):
+        names = list(residuals.columns) if names is None else names
+        x = residuals.to_numpy(dtype=float)
+    elif isinstance(residuals, dict):
+        names = list(residuals) if names is None else names
+        x = residual_matrix(residuals.values())
+    else:
+        if not isinstance(residuals, np.ndarray):
+            residuals = residual_matrix(residuals)
+        x = np.asarray(residuals, dtype=float)
+        if x.ndim == 1:
+            x = x[:, None]
+        names = list(range(x.shape[1])) if names is None else names
+    lags = list(range(1, lags + 1)) if isinstance(lags, int) else sorted(set(int(l) for l in lags))
+    if not lags or lags[0] < 1:
+        raise ValueError("lags must be positive")
+    if lags[-1] >= len(x):
+        raise ValueError(f"largest lag {lags[-1]} needs more than {len(x)} observations")
+
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    starts = list(range(0, x.shape[1], block)) or [0]
+    with stage('diagnose', series=x.shape[1], lags=len(lags)):
+        if max_workers == 1 or len(starts) == 1:
+            parts = [_diagnose_block(x[:, s:s + block], lags, model_df) for s in starts]
+        else:
+            with ProcessPoolExecutor(max_workers=min(max_workers, len(starts))) as executor:
+                parts = list(executor.map(_diagnose_block,
+                                          [x[:, s:s + block] for s in starts],
+                                          [lags] * len(starts), [model_df] * len(starts)))
+    return Diagnostics(names, lags, parts)
+
+
+def fit_residuals(results, standardized=False):
+    """Residuals of a fitted state-space model.
+
+    standardized=True gives the standardized forecast errors after the
+    burn-in periods, which is what the summary's JB and H tests use.
+    """
+    if not standardized:
+        return np.asarray(results.resid, dtype=float)
+    burn = max(results.loglikelihood_burn, getattr(results, 'nobs_diffuse', 0))
+    return np.asarray(results.filter_results.standardized_forecasts_error[0, burn:], dtype=float)
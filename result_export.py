@@ -0,0 +1,175 @@
+"""Structured export of fitted statsmodels state-space results (ARIMA, SARIMAX).
+
+ModelReport collects what the scripts read off `results.summary()`: the
+coefficient table, information criteria and the diagnostic tests of the
+summary footer. These are available as a dict, JSON or DataFrame rows without
+building the SimpleTable summary. The text summary is rendered only when
+`.text` is accessed. Its Date/Time rows can be pinned to a fixed timestamp,
+so outputs are reproducible.
+"""
+import json
+import math
+import os
+import re
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+from instrument import stage
+
+DATE_FORMAT = "%a, %d %b %Y"
+TIME_FORMAT = "%H:%M:%S"
+
+_DATE_RE = re.compile(r"[A-Z][a-z]{2}, \d{2} [A-Z][a-z]{2} \d{4}")
+_TIME_RE = re.compile(r"\d{2}:\d{2}:\d{2}")
+
+
+def resolve_timestamp(timestamp=None):
+    """datetime for a report: the given datetime or epoch seconds, else
+    $SOURCE_DATE_EPOCH when set, else None (the time of rendering)."""
+    if timestamp is None and os.environ.get('SOURCE_DATE_EPOCH'):
+        timestamp = int(os.environ['SOURCE_DATE_EPOCH'])
+    if isinstance(timestamp, (int, float)):
+        return datetime.fromtimestamp(timestamp, tz=timezone.utc)
+    return timestamp
+
+
+def pin_timestamp(text, timestamp):
+    """Replace the Date:/Time: values of a rendered summary, keeping alignment."""
+    if timestamp is None:
+        return text
+    date, clock = timestamp.strftime(DATE_FORMAT), timestamp.strftime(TIME_FORMAT)
+    lines = text.split('\n')
+    for i, line in enumerate(lines):
+        if line.startswith('Date:'):
+            lines[i] = _DATE_RE.sub(date, line, count=1)
+        elif line.startswith('Time:'):
+            lines[i] = _TIME_RE.sub(clock, line, count=1)
+    return '\n'.join(lines)
+
+
+def _number(value):
+    value = float(value)
+    return None if math.isnan(value) or math.isinf(value) else value
+
+
+def _diagnostics(results):
+    # The same tests, lags and fallbacks as the summary footer.
+    out = {}
+    try:
+        lb = results.test_serial_correlation(method='ljungbox', lags=[1])
+        out['ljung_box'] = {'lag': 1, 'q': _number(lb[0, 0, -1]), 'p_value': _number(lb[0, 1, -1])}
+    except Exception:
+        out['ljung_box'] = {'lag': 1, 'q': None, 'p_value': None}
+    try:
+        het = results.test_heteroskedasticity(method='breakvar')
+        out['heteroskedasticity'] = {'h': _number(het[0, 0]), 'p_value': _number(het[0, 1])}
+    except Exception:
+        out['heteroskedasticity'] = {'h': None, 'p_value': None}
+    try:
+        jb = results.test_normality(method='jarquebera')
+        out['jarque_bera'] = {'jb': _number(jb[0, 0]), 'p_value': _number(jb[0, 1]),
+                              'skew': _number(jb[0, 2]), 'kurtosis': _number(jb[0, 3])}
+    except Exception:
+        out['jarque_bera'] = {'jb': None, 'p_value': None, 'skew': None, 'kurtosis': None}
+    return out
+
+
+class ModelReport:
+    """Structured view of one fitted model.
+
+    record  -- plain dict (JSON-ready) with criteria, coefficients and tests
+    text    -- the statsmodels summary, rendered on first access, with the
+               timestamp pinned if one was given; see render()
+    """
+
+    def __init__(self, results, name=None, timestamp=None, alpha=0.05):
+        self.results = results
+        self.name = name or results.model.__class__.__name__
+        self.timestamp = resolve_timestamp(timestamp)
+        self.alpha = alpha
+        self._record = None
+        self._text = None
+
+    @property
+    def record(self):
+        if self._record is None:
+            with stage('diagnose', model=self.name):
+                self._record = self._build_record()
+        return self._record
+
+    def _build_record(self):
+        res = self.results
+        ci = np.asarray(res.conf_int(alpha=self.alpha))
+        params, bse = np.asarray(res.params), np.asarray(res.bse)
+        zvalues, pvalues = np.asarray(res.zvalues), np.asarray(res.pvalues)
+        coefficients = [{'name': name, 'coef': _number(params[i]), 'std_err': _number(bse[i]),
+                         'z': _number(zvalues[i]), 'p_value': _number(pvalues[i]),
+                         'ci_lower': _number(ci[i, 0]), 'ci_upper': _number(ci[i, 1])}
+                        for i, name in enumerate(res.param_names)]
+        return {
+            'model': self.name,
+            'timestamp': None if self.timestamp is None else self.timestamp.isoformat(),
+            'nobs': int(res.nobs),
+            'llf': _number(res.llf),
+            'aic': _number(res.aic),
+            'bic': _number(res.bic),
+            'hqic': _number(res.hqic),
+            'cov_type': res.cov_type,
+            'coefficients': coefficients,
+            **_diagnostics(res),
+        }
+
+    @property
+    def text(self):
+        if self._text is None:
+            with stage('report', model=self.name):
+                self._text = pin_timestamp(str(self.results.summary(alpha=self.alpha)), self.timestamp)
+        return self._text
+
+    def render(self, rstrip=False):
+        """The summary text, optionally without trailing spaces on each line."""
+        if not rstrip:
+            return self.text
+        return '\n'.join(line.rstrip() for line in self.text.split('\n'))
+
+    def to_json(self, **kwargs):
+        return json.dumps(self.record, **kwargs)
+
+    def stats_row(self):
+        """The record flattened to one row: criteria and diagnostic tests."""
+        rec = self.record
+        row = {k: rec[k] for k in ('model', 'timestamp', 'nobs', 'llf', 'aic', 'bic', 'hqic')}
+        for test in ('ljung_box', 'heteroskedasticity', 'jarque_bera'):
+            for key, value in rec[test].items():
+                row[f'{test}_{key}'] = value
+        return row
+
+    def coefficient_rows(self):
+        return [{'model': self.name, **coef} for coef in self.record['coefficients']]
+
+
+def stats_frame(reports):
+    """One row per model."""
+    return pd.DataFrame([r.stats_row() for r in reports])
+
+
+def coefficient_frame(reports):
+    """Tidy coefficient table: one row per (model, parameter)."""
+    return pd.DataFrame([row for r in reports for row in r.coefficient_rows()])
+
+
+def export(reports, path):
+    """Write reports to `path`: a JSON list for .json, else two CSVs, `path`
+    with the per-model statistics and `<stem>_coefficients.csv` beside it."""
+    reports = list(reports)
+    if path.endswith('.json'):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump([r.record for r in reports], f, indent=2)
+        return [path]
+    stem, ext = os.path.splitext(path)
+    coef_path = f'{stem}_coefficients{ext or ".csv"}'
+    stats_frame(reports).to_csv(path, index=False)
+    coefficient_frame(reports).to_csv(coef_path, index=False)
+    return [path, coef_path]
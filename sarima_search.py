@@ -0,0 +1,179 @@
+"""Parallel, time-bounded seasonal ARIMA order search on statsmodels SARIMAX.
+
+An alternative to `pm.auto_arima(..., seasonal=True)` that needs no pmdarima
+and uses every core. The search runs in two stages:
+
+1. every (p,d,q)(P,D,Q,m) candidate gets a cheap fit (few optimizer
+   iterations, no smoother output) that only yields an information-criterion
+   estimate;
+2. the `keep` best candidates are fitted fully, warm-started from the cheap
+   parameters, and the best of those is returned.
+
+Both stages share one wall-clock budget. The differencing orders d and D
+are chosen with a KPSS test and a seasonal-strength test when not given,
+as auto_arima does by default.
+"""
+import time
+import warnings
+from functools import partial
+from itertools import product
+
+import numpy as np
+import pandas as pd
+
+from instrument import traced
+from order_search import search_orders
+
+
+class CheapFit:
+    """Information criteria and parameters of a truncated fit, small enough to
+    send back from a worker process."""
+
+    def __init__(self, res):
+        self.aic = res.aic
+        self.bic = res.bic
+        self.hqic = res.hqic
+        self.llf = res.llf
+        self.params = np.asarray(res.params)
+
+
+def sarima_label(candidate):
+    (p, d, q), (P, D, Q, m) = candidate
+    return f"SARIMA({p},{d},{q})({P},{D},{Q},{m})"
+
+
+def ndiffs(y, alpha=0.05, max_d=2):
+    """Smallest d for which the KPSS test does not reject level stationarity."""
+    from statsmodels.tsa.stattools import kpss
+
+    y = np.asarray(y, dtype=float)
+    for d in range(max_d + 1):
+        if len(y) < 10:
+            return d
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            pvalue = kpss(y, regression='c', nlags='auto')[1]
+        if pvalue >= alpha:
+            return d
+        y = np.diff(y)
+    return max_d
+
+
+def nsdiffs(y, m, threshold=0.64, max_D=1):
+    """Seasonal differences needed, by the seasonal-strength rule.
+
+    Strength = 1 - var(remainder) / var(seasonal + remainder) of an STL
+    decomposition; above `threshold` the series is differenced at lag m.
+    """
+    from statsmodels.tsa.seasonal import STL
+
+    y = np.asarray(y, dtype=float)
+    for D in range(max_D + 1):
+        if m < 2 or len(y) < 2 * m + 1:
+            return D
+        res = STL(y, period=m).fit()
+        strength = max(0.0, 1 - np.var(res.resid) / np.var(res.seasonal + res.resid))
+        if strength <= threshold:
+            return D
+        y = y[m:] - y[:-m]
+    return max_D
+
+
+def fit_sarimax(series, candidate, maxiter=50, start_params=None, cheap=False):
+    """Fit one (order, seasonal_order) candidate; module level for the pool."""
+    warnings.filterwarnings("ignore")
+    from statsmodels.tsa.statespace.sarimax import SARIMAX
+
+    order, seasonal_order = candidate
+    trend = 'c' if order[1] + seasonal_order[1] == 0 else None
+    model = SARIMAX(series, order=order, seasonal_order=seasonal_order, trend=trend)
+    if cheap:
+        return CheapFit(model.fit(disp=False, maxiter=maxiter, low_memory=True))
+    return model.fit(disp=False, maxiter=maxiter, start_params=start_params)
+
+
+def _fit_warm(series, candidate, starts, maxiter):
+    return fit_sarimax(series, candidate, maxiter=maxiter, start_params=starts.get(candidate))
+
+
+class SarimaSearch:
+    """Outcome of sarima_search().
+
+    best         -- fully fitted SARIMAX results of the winning candidate
+    best_order   -- its ((p,d,q), (P,D,Q,m))
+    leaderboard  -- DataFrame of every candidate, best first, with the cheap
+                    estimate, the full-fit criterion and a status column
+    """
+
+    def __init__(self, best_order, best, leaderboard, d, D):
+        self.best_order = best_order
+        self.best = best
+        self.leaderboard = leaderboard
+        self.d = d
+        self.D = D
+
+
+def sarima_candidates(d, D, m, max_p=3, max_q=3, max_P=1, max_Q=1):
+    return [((p, d, q), (P, D, Q, m))
+            for p, q, P, Q in product(range(max_p + 1), range(max_q + 1),
+                                      range(max_P + 1), range(max_Q + 1))]
+
+
+@traced('sarima_search')
+def sarima_search(series, m=12, d=None, D=None, max_p=3, max_q=3, max_P=1, max_Q=1,
+                  criterion='aic', keep=5, cheap_iter=10, maxiter=50,
+                  max_workers=None, time_budget=None):
+    """Search seasonal ARIMA orders of `series`; see the module docstring.
+
+    keep         -- candidates that survive the cheap stage
+    cheap_iter   -- optimizer iterations for the cheap estimates
+    time_budget  -- seconds for the whole search; candidates not reached are
+                    reported as skipped. If no full fit finished in time, the
+                    best cheap candidate is still fitted so a model is returned
+    """
+    start = time.monotonic()
+    y = pd.Series(series).dropna()
+    if m < 2:
+        # No seasonal part: plain ARIMA candidates.
+        m, D, max_P, max_Q = 0, 0, 0, 0
+    if d is None:
+        d = ndiffs(y)
+    if D is None:
+        D = nsdiffs(y, m)
+    candidates = sarima_candidates(d, D, m, max_p, max_q, max_P, max_Q)
+
+    def remaining():
+        return None if time_budget is None else max(0.0, time_budget - (time.monotonic() - start))
+
+    cheap = search_orders(y, candidates, criterion, max_workers, remaining(),
+                          fit=partial(fit_sarimax, maxiter=cheap_iter, cheap=True))
+    ranked = sorted(cheap.fits, key=cheap.score)
+    survivors = [c for c in ranked if np.isfinite(cheap.score(c))][:keep]
+    starts = {c: cheap.fits[c].params for c in survivors}
+
+    full = search_orders(y, survivors, criterion, max_workers, remaining(),
+                         fit=partial(_fit_warm, starts=starts, maxiter=maxiter))
+    if full.best is None and survivors:
+        full = search_orders(y, survivors[:1], criterion, max_workers=1,
+                             fit=partial(_fit_warm, starts=starts, maxiter=maxiter))
+
+    rows = []
+    for c in candidates:
+        if c in full.fits:
+            status = 'fitted'
+        elif c in full.errors or c in cheap.errors:
+            status = 'failed'
+        elif c in full.skipped or c in cheap.skipped:
+            status = 'skipped'
+        else:
+            status = 'pruned'
+        rows.append({
+            'model': sarima_label(c),
+            'order': c[0],
+            'seasonal_order': c[1],
+            f'cheap_{criterion}': cheap.score(c) if c in cheap.fits else np.nan,
+            criterion: full.score(c) if c in full.fits else np.nan,
+            'status': status,
+        })
+    leaderboard = pd.DataFrame(rows).sort_values([criterion, f'cheap_{criterion}'], na_position='last')
+    return SarimaSearch(full.best_order, full.best, leaderboard.reset_index(drop=True), d, D)
@@ -0,0 +1,194 @@
+"""Memory-mapped binary storage for long numeric series.
+
+A store file holds every numeric column of a table as a contiguous float64
+block, so one column can be read as a NumPy view of the mapped file: nothing
+is parsed or copied, and only the pages that are touched are read. A regular
+DatetimeIndex is stored as its start and frequency alone; any other index
+as one int64 block of nanosecond timestamps.
+
+Layout: 8-byte magic, little-endian uint64 header length, JSON header, then
+the 64-byte aligned data blocks whose offsets the header lists.
+
+load_series() keeps a store next to a CSV (`<file>.csv.series`), or in the
+temp directory when the CSV's directory is read-only, rebuilt whenever the
+CSV's size or modification time changes.
+"""
+import hashlib
+import json
+import os
+import struct
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+MAGIC = b'NLPSER1\n'
+ALIGN = 64
+
+
+def _aligned(n):
+    return -(-n // ALIGN) * ALIGN
+
+
+def _index_header(index):
+    if isinstance(index, pd.DatetimeIndex):
+        freq = index.freq or (pd.infer_freq(index) if len(index) >= 3 else None)
+        if freq is not None and len(index) and index.tz is None:
+            expected = pd.date_range(index[0], periods=len(index), freq=freq)
+            if expected.equals(index):
+                return {'kind': 'range', 'start': int(index[0].value),
+                        'freq': pd.tseries.frequencies.to_offset(freq).freqstr,
+                        'name': index.name}, None
+        # asi8 is in the index's own unit, which need not be nanoseconds.
+        return {'kind': 'datetime', 'name': index.name}, index.values.astype('M8[ns]').view('<i8')
+    if isinstance(index, pd.RangeIndex):
+        return {'kind': 'rangeindex', 'start': index.start, 'step': index.step,
+                'name': index.name}, None
+    return {'kind': 'int', 'name': index.name}, np.asarray(index, dtype='<i8')
+
+
+def write_store(df, path, source=None):
+    """Write the numeric columns of `df` (and its index) to `path`.
+
+    Non-numeric columns are left out; integer and boolean columns are
+    stored as float64. `source` is kept in the header for staleness checks.
+    """
+    numeric = df.select_dtypes(include=['number', 'bool'])
+    index_header, index_values = _index_header(df.index)
+    blocks = []
+    if index_values is not None:
+        blocks.append(('__index__', index_values))
+    for name in numeric.columns:
+        blocks.append((str(name), numeric[name].to_numpy(dtype='<f8', na_value=np.nan)))
+
+    header = {'nrows': len(df), 'index': index_header, 'columns': {}, 'source': source}
+    # Offsets depend on the header length, so size the header with
+    # placeholder offsets first; the real ones have the same width.
+    width = 20
+    for name, _ in blocks:
+        header['columns'][name] = 10 ** (width - 1)
+    size = len(MAGIC) + 8 + len(json.dumps(header).encode())
+    offset = _aligned(size)
+    for name, values in blocks:
+        header['columns'][name] = offset
+        offset = _aligned(offset + values.nbytes)
+    encoded = json.dumps(header).encode().ljust(size - len(MAGIC) - 8)
+
+    tmp = path + '.tmp'
+    with open(tmp, 'wb') as f:
+        f.write(MAGIC + struct.pack('<Q', len(encoded)) + encoded)
+        for name, values in blocks:
+            f.seek(header['columns'][name])
+            f.write(values.tobytes())
+        f.truncate(offset)
+    os.replace(tmp, path)
+
+
+def read_header(path):
+    with open(path, 'rb') as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path} is not a series store")
+        (length,) = struct.unpack('<Q', f.read(8))
+        return json.loads(f.read(length))
+
+
+class SeriesStore:
+    """Read-only view of a store file.
+
+    column(name) returns a float64 NumPy view of the mapped file,
+    series(name) the same data as a pandas Series with the stored index.
+    The file is mapped once and shared by every column.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.header = read_header(path)
+        self.nrows = self.header['nrows']
+        self._map = None
+        self._index = None
+
+    @property
+    def columns(self):
+        return [c for c in self.header['columns'] if c != '__index__']
+
+    def _mapped(self):
+        if self._map is None:
+            self._map = np.memmap(self.path, dtype=np.uint8, mode='r')
+        return self._map
+
+    def _block(self, name, dtype):
+        offset = self.header['columns'][name]
+        return self._mapped()[offset:offset + 8 * self.nrows].view(dtype)
+
+    def column(self, name):
+        if name not in self.columns:
+            raise KeyError(name)
+        return self._block(name, '<f8')
+
+    @property
+    def index(self):
+        if self._index is None:
+            info = self.header['index']
+            kind = info['kind']
+            if kind == 'range':
+                index = pd.date_range(pd.Timestamp(info['start']), periods=self.nrows,
+                                      freq=info['freq'], name=info['name'])
+            elif kind == 'datetime':
+                index = pd.DatetimeIndex(self._block('__index__', '<i8').view('M8[ns]'),
+                                         name=info['name'])
+            elif kind == 'rangeindex':
+                index = pd.RangeIndex(info['start'], info['start'] + info['step'] * self.nrows,
+                                      info['step'], name=info['name'])
+            else:
+                index = pd.Index(self._block('__index__', '<i8'), name=info['name'])
+            self._index = index
+        return self._index
+
+    def series(self, name):
+        return pd.Series(self.column(name), index=self.index, name=name, copy=False)
+
+    def frame(self, columns=None):
+        columns = self.columns if columns is None else columns
+        return pd.DataFrame({c: self.column(c) for c in columns}, index=self.index, copy=False)
+
+
+def store_path(csv_path):
+    return csv_path + '.series'
+
+
+def temp_store_path(csv_path):
+    """Fallback location for a CSV in a read-only directory; the hash of the
+    absolute path keeps same-named CSVs from different directories apart."""
+    digest = hashlib.sha256(os.path.abspath(csv_path).encode()).hexdigest()[:16]
+    return os.path.join(tempfile.gettempdir(), f'{os.path.basename(csv_path)}-{digest}.series')
+
+
+def open_store(csv_path, date_col=None, dayfirst=None):
+    """SeriesStore for a CSV, built (or rebuilt, if the CSV changed) on demand."""
+    from csv_loader import load_csv
+
+    path = store_path(csv_path)
+    fallback = temp_store_path(csv_path)
+    stat = os.stat(csv_path)
+    source = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns,
+              'date_col': date_col, 'dayfirst': dayfirst}
+    for candidate in (path, fallback):
+        try:
+            store = SeriesStore(candidate)
+            if store.header.get('source') == source:
+                return store
+        except (OSError, ValueError):
+            pass
+    df = load_csv(csv_path, date_col=date_col, dayfirst=dayfirst, cache=False)
+    try:
+        write_store(df, path, source)
+    except OSError:
+        # Read-only data directory: keep the store in the temp directory.
+        write_store(df, fallback, source)
+        path = fallback
+    return SeriesStore(path)
+
+
+def load_series(csv_path, column, date_col=None, dayfirst=None):
+    """One numeric column of a CSV as a Series backed by the mapped store."""
+    return open_store(csv_path, date_col, dayfirst).series(column)
@@ -0,0 +1,190 @@
+"""Shared spaCy model loader for the Day5/Day6 text scripts.
+
+load_model() loads only the pipeline components a task needs and keeps one
+Language object per (model, components) for the life of the process.
+
+For repeated runs there is also a long-lived worker: it loads the models
+once, then forks a child for every request, so a script run through it
+never pays for `import spacy` or the model load (Unix only).
+
+    python spacy_loader.py serve --tasks lemma pos &
+    echo sample.txt | python spacy_loader.py run Day5/Practice_Q2.py
+"""
+import argparse
+import io
+import json
+import os
+import runpy
+import signal
+import socket
+import struct
+import sys
+from functools import lru_cache
+
+DEFAULT_MODEL = "en_core_web_sm"
+
+
+def _default_socket():
+    # The worker runs whatever script it is sent, so the socket lives in the
+    # per-user runtime directory when there is one and is only ever 0600.
+    if not hasattr(os, "getuid"):
+        return None
+    if os.environ.get("XDG_RUNTIME_DIR"):
+        return os.path.join(os.environ["XDG_RUNTIME_DIR"], "spacy_loader.sock")
+    return os.path.join("/tmp", f"spacy_loader-{os.getuid()}.sock")
+
+
+DEFAULT_SOCKET = _default_socket()
+
+# Components each task can do without. The lemmatizer needs POS from the
+# tagger and attribute_ruler; sentences and nsubj need the parser.
+TASK_EXCLUDES = {
+    "full": (),
+    "tokenize": ("tok2vec", "tagger", "parser", "attribute_ruler", "lemmatizer", "ner"),
+    "lemma": ("parser", "ner"),
+    "pos": ("parser", "ner", "lemmatizer"),
+    "subject": ("lemmatizer",),
+}
+
+
+def load_model(task="full", name=DEFAULT_MODEL, exclude=None):
+    """Return the memoized Language object for `task`.
+
+    `exclude` overrides the task's component list. Raises OSError, like
+    spacy.load, when the model is not installed.
+    """
+    if exclude is None:
+        exclude = TASK_EXCLUDES[task]
+    return _load(name, tuple(sorted(exclude)))
+
+
+@lru_cache(maxsize=None)
+def _load(name, exclude):
+    import spacy
+    from instrument import stage
+    with stage('load', model=name, exclude=list(exclude)):
+        return spacy.load(name, exclude=list(exclude))
+
+
+def _recv_request(conn):
+    with conn.makefile("rb") as f:
+        return json.loads(f.readline())
+
+
+def _send_response(conn, response):
+    conn.sendall(json.dumps(response).encode("utf-8") + b"\n")
+
+
+def _peer_uid(conn):
+    """uid of the process on the other end of a Unix socket, None if unknown."""
+    if not hasattr(socket, "SO_PEERCRED"):
+        return None
+    creds = conn.getsockopt(socket.SOL_SOCKET, socket.SO_PEERCRED, struct.calcsize("3i"))
+    return struct.unpack("3i", creds)[1]
+
+
+def _run_script(request):
+    """Run a script as __main__ with the request's stdin, capturing its output."""
+    script = os.path.abspath(request["script"])
+    out, err = io.StringIO(), io.StringIO()
+    sys.argv = [script] + request.get("args", [])
+    # The scripts resolve their input files against sys.path[0].
+    sys.path[0] = os.path.dirname(script)
+    sys.stdin = io.StringIO(request.get("stdin", ""))
+    sys.stdout, sys.stderr = out, err
+    code = 0
+    try:
+        runpy.run_path(script, run_name="__main__")
+    except SystemExit as exc:
+        code = exc.code if isinstance(exc.code, int) else (0 if exc.code is None else 1)
+    except BaseException as exc:
+        err.write(f"{type(exc).__name__}: {exc}\n")
+        code = 1
+    finally:
+        sys.stdout, sys.stderr = sys.__stdout__, sys.__stderr__
+    return {"stdout": out.getvalue(), "stderr": err.getvalue(), "code": code}
+
+
+def serve(socket_path=DEFAULT_SOCKET, tasks=("full",), name=DEFAULT_MODEL):
+    """Preload the models for `tasks` and serve script runs until killed."""
+    for task in tasks:
+        load_model(task, name)
+    if os.path.exists(socket_path):
+        os.unlink(socket_path)
+    # Children are never waited on individually.
+    signal.signal(signal.SIGCHLD, signal.SIG_IGN)
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    # Owner-only from the moment it exists; the chmod covers odd umask handling.
+    umask = os.umask(0o177)
+    try:
+        server.bind(socket_path)
+    finally:
+        os.umask(umask)
+    os.chmod(socket_path, 0o600)
+    server.listen()
+    print(f"spaCy worker ready on {socket_path}", file=sys.stderr)
+    try:
+        while True:
+            conn, _ = server.accept()
+            uid = _peer_uid(conn)
+            if uid is not None and uid != os.getuid():
+                print(f"spaCy worker: refused a connection from uid {uid}", file=sys.stderr)
+                conn.close()
+                continue
+            if os.fork() == 0:
+                # Child: the models are already loaded and shared copy-on-write.
+                server.close()
+                try:
+                    _send_response(conn, _run_script(_recv_request(conn)))
+                finally:
+                    conn.close()
+                    os._exit(0)
+            conn.close()
+    finally:
+        server.close()
+        os.unlink(socket_path)
+
+
+def run(script, args=(), socket_path=DEFAULT_SOCKET):
+    """Run `script` through a worker started with serve(); returns its exit code.
+
+    Reads all of this process's stdin first, since the scripts only read a
+    file name from it.
+    """
+    request = {"script": os.path.abspath(script), "args": list(args), "stdin": sys.stdin.read()}
+    client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    client.connect(socket_path)
+    try:
+        _send_response(client, request)
+        response = _recv_request(client)
+    finally:
+        client.close()
+    sys.stdout.write(response["stdout"])
+    sys.stderr.write(response["stderr"])
+    return response["code"]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Long-lived spaCy worker for the text scripts.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    p_serve = sub.add_parser("serve", help="load the models and wait for scripts to run")
+    p_serve.add_argument("--socket", default=DEFAULT_SOCKET)
+    p_serve.add_argument("--model", default=DEFAULT_MODEL)
+    p_serve.add_argument("--tasks", nargs="+", default=["full"], choices=sorted(TASK_EXCLUDES))
+    p_run = sub.add_parser("run", help="run a script in the worker, stdin is forwarded")
+    p_run.add_argument("--socket", default=DEFAULT_SOCKET)
+    p_run.add_argument("script")
+    p_run.add_argument("args", nargs=argparse.REMAINDER)
+    args = parser.parse_args(argv)
+
+    if args.command == "serve":
+        serve(args.socket, args.tasks, args.model)
+    else:
+        sys.exit(run(args.script, args.args, args.socket))
+
+
+if __name__ == "__main__":
+    # Scripts run by the worker import this module by name; make that the
+    # same module object so they see the preloaded models.
+    sys.modules.setdefault("spacy_loader", sys.modules[__name__])
+    main()
@@ -0,0 +1,66 @@
+"""Immutable stop-word filter for spaCy tokens.
+
+StopWordFilter is built once from a base list plus additions and removals,
+without touching `nlp.Defaults.stop_words` or `Lexeme.is_stop`. Tokens are
+matched on `token.lower`, the precomputed hash of their lowercase form, so
+no lowercased string is allocated per token. The hashes are the same in
+every process, and the filter never changes after construction, so one
+instance can be shared by threads and pickled to nlp.pipe workers.
+"""
+
+
+class StopWordFilter:
+    """Stop words = (base | add) - remove, all compared in lowercase.
+
+    base defaults to spaCy's English STOP_WORDS.
+    """
+
+    __slots__ = ('_words', '_hashes')
+
+    def __init__(self, base=None, add=(), remove=()):
+        from spacy.strings import hash_string
+
+        if base is None:
+            from spacy.lang.en.stop_words import STOP_WORDS
+            base = STOP_WORDS
+        words = {w.lower() for w in base}
+        words.update(w.lower() for w in add)
+        words.difference_update(w.lower() for w in remove)
+        self._words = frozenset(words)
+        self._hashes = frozenset(hash_string(w) for w in words)
+
+    def __reduce__(self):
+        # __slots__ without __dict__: rebuild from the word list when pickled.
+        return (StopWordFilter, (self._words,))
+
+    def __len__(self):
+        return len(self._words)
+
+    def __contains__(self, word):
+        """`word` may be a string or a lowercase-form hash such as token.lower."""
+        if isinstance(word, int):
+            return word in self._hashes
+        return word.lower() in self._words
+
+    @property
+    def words(self):
+        return self._words
+
+    def with_words(self, add=(), remove=()):
+        """A new filter with further additions and removals; this one is unchanged."""
+        return StopWordFilter(self._words, add, remove)
+
+    def is_stop(self, token):
+        return token.lower in self._hashes
+
+    def keep(self, tokens, drop_space=True, drop_punct=False):
+        """Yield the tokens that are not stop words (nor spaces/punctuation if asked)."""
+        hashes = self._hashes
+        for token in tokens:
+            if token.lower in hashes:
+                continue
+            if drop_space and token.is_space:
+                continue
+            if drop_punct and token.is_punct:
+                continue
+            yield token
@@ -0,0 +1,84 @@
+"""Streaming spaCy processing for large text files.
+
+Instead of `nlp(f.read())`, the file is read lazily in paragraph (or line)
+chunks and fed through `nlp.pipe`, so only a batch of small Docs is alive at
+a time and spaCy's max_length never applies to the whole file.
+
+Chunks keep their trailing newlines, and a paragraph's leading indentation
+stays with the blank lines before it, so in paragraph mode the tokens of the
+streamed Docs are the same as those of one Doc over the whole file,
+whitespace tokens included. Line mode, and paragraphs cut at `max_chars`, may
+split a run of whitespace into more than one whitespace token.
+"""
+import os
+from itertools import islice
+
+# Below this size the start-up cost of extra processes outweighs the gain.
+PARALLEL_MIN_BYTES = 50 * 1024 * 1024
+MAX_CHUNK_CHARS = 100_000
+
+
+def read_head(path, n_chars):
+    """First `n_chars` characters of a file, without reading the rest."""
+    with open(path, 'r', encoding='utf-8') as f:
+        return f.read(n_chars)
+
+
+def read_lines(path, n_lines):
+    """First `n_lines` lines of a file, newline characters stripped."""
+    with open(path, 'r', encoding='utf-8') as f:
+        return [line.rstrip('\n') for line in islice(f, n_lines)]
+
+
+def iter_chunks(path, by='paragraph', max_chars=MAX_CHUNK_CHARS):
+    """Yield the text of `path` in pieces that concatenate back to the file.
+
+    by='paragraph' ends a chunk after a run of blank lines and the
+    indentation of the next paragraph, by='line' yields every line.
+    Paragraphs longer than `max_chars` are cut at a line end.
+    """
+    if by not in ('paragraph', 'line'):
+        raise ValueError(f"by must be 'paragraph' or 'line', not {by!r}")
+    with open(path, 'r', encoding='utf-8') as f:
+        if by == 'line':
+            yield from f
+            return
+        lines = []
+        size = 0
+        for line in f:
+            # A non-blank line after blank ones starts a new paragraph.
+            if line.strip() and lines and not lines[-1].strip():
+                # Its indentation belongs to the whitespace token before it.
+                text = line.lstrip()
+                lines.append(line[:len(line) - len(text)])
+                yield ''.join(lines)
+                lines, size, line = [], 0, text
+            lines.append(line)
+            size += len(line)
+            if size >= max_chars:
+                yield ''.join(lines)
+                lines, size = [], 0
+        if lines:
+            yield ''.join(lines)
+
+
+def default_n_process(path):
+    """One process for ordinary files, every core for very large ones."""
+    if os.path.getsize(path) >= PARALLEL_MIN_BYTES:
+        return os.cpu_count() or 1
+    return 1
+
+
+def pipe_file(nlp, path, by='paragraph', batch_size=64, n_process=None,
+              max_chars=MAX_CHUNK_CHARS):
+    """Yield Docs for the chunks of `path`, in file order."""
+    if n_process is None:
+        n_process = default_n_process(path)
+    chunks = iter_chunks(path, by, max_chars)
+    return nlp.pipe(chunks, batch_size=batch_size, n_process=n_process)
+
+
+def iter_tokens(nlp, path, **kwargs):
+    """Yield every token of `path`; keyword arguments go to pipe_file()."""
+    for doc in pipe_file(nlp, path, **kwargs):
+        yield from doc